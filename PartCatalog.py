@@ -0,0 +1,204 @@
+import json
+from bisect import bisect_left, insort
+from Supplier_rep_base import Supplier_rep_base, atomic_open
+
+
+class PartCatalog:
+    """
+    Каталог деталей: какой поставщик продаёт какой артикул и по какой цене.
+
+    По README один артикул могут продавать несколько поставщиков, у каждого — своя
+    фиксированная цена. Индексы:
+    - артикул -> {supplier_id: цена} (dict, O(1));
+    - артикул -> (цена, supplier_id) лучшего предложения, поддерживается при изменениях;
+    - отсортированный список артикулов для поиска по префиксу (bisect, O(log n + k));
+    - supplier_id -> артикулы, чтобы снять все предложения удалённого поставщика.
+
+    Хранится отдельным JSON-файлом рядом с файлами репозиториев (например, parts.json).
+    """
+
+    def __init__(self):
+        self._offers = {}
+        self._best = {}
+        self._articles = []
+        self._part_names = {}
+        self._by_supplier = {}
+
+    # --- Изменение ---
+    def set_offer(self, part_article: str, supplier_id: int, part_price: float, part_name: str | None = None) -> None:
+        """
+        Задаёт (или меняет) цену артикула у поставщика
+        """
+        part_price = float(part_price)
+        offers = self._offers.get(part_article)
+        if offers is None:
+            offers = self._offers[part_article] = {}
+            insort(self._articles, part_article)
+        old_price = offers.get(supplier_id)
+        offers[supplier_id] = part_price
+        self._by_supplier.setdefault(supplier_id, set()).add(part_article)
+        if part_name is not None:
+            self._part_names[part_article] = part_name
+
+        best = self._best.get(part_article)
+        if best is None or (part_price, supplier_id) < best:
+            self._best[part_article] = (part_price, supplier_id)
+        elif best[1] == supplier_id and old_price is not None and part_price > old_price:
+            # лучшее предложение подорожало — пересчитываем по предложениям артикула
+            self._recompute_best(part_article)
+
+    def remove_offer(self, part_article: str, supplier_id: int) -> bool:
+        offers = self._offers.get(part_article)
+        if offers is None or supplier_id not in offers:
+            return False
+
+        del offers[supplier_id]
+        articles = self._by_supplier[supplier_id]
+        articles.discard(part_article)
+        if not articles:
+            del self._by_supplier[supplier_id]
+
+        if not offers:
+            del self._offers[part_article]
+            del self._best[part_article]
+            self._part_names.pop(part_article, None)
+            i = bisect_left(self._articles, part_article)
+            del self._articles[i]
+        elif self._best[part_article][1] == supplier_id:
+            self._recompute_best(part_article)
+        return True
+
+    def remove_supplier(self, supplier_id: int) -> int:
+        """
+        Снимает все предложения поставщика (например, после delete_by_id в репозитории).
+        Возвращает количество снятых предложений.
+        """
+        articles = list(self._by_supplier.get(supplier_id, ()))
+        for part_article in articles:
+            self.remove_offer(part_article, supplier_id)
+        return len(articles)
+
+    def _recompute_best(self, part_article: str) -> None:
+        self._best[part_article] = min((price, sid) for sid, price in self._offers[part_article].items())
+
+    # --- Запросы ---
+    def __len__(self):
+        return len(self._articles)
+
+    def __contains__(self, part_article):
+        return part_article in self._offers
+
+    def offers(self, part_article: str) -> dict:
+        """
+        supplier_id -> цена для артикула (пустой словарь, если артикула нет)
+        """
+        return dict(self._offers.get(part_article, {}))
+
+    def price(self, part_article: str, supplier_id: int):
+        return self._offers.get(part_article, {}).get(supplier_id)
+
+    def part_name(self, part_article: str):
+        return self._part_names.get(part_article)
+
+    def best_price(self, part_article: str):
+        """
+        (supplier_id, цена) самого дешёвого предложения или None.
+        При равной цене — поставщик с меньшим supplier_id.
+        """
+        best = self._best.get(part_article)
+        if best is None:
+            return None
+        return best[1], best[0]
+
+    def search_prefix(self, prefix: str, limit: int | None = None) -> list:
+        """
+        Артикулы, начинающиеся с prefix, по возрастанию
+        """
+        result = []
+        i = bisect_left(self._articles, prefix)
+        while i < len(self._articles) and self._articles[i].startswith(prefix):
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(self._articles[i])
+            i += 1
+        return result
+
+    def articles_of(self, supplier_id: int) -> list:
+        return sorted(self._by_supplier.get(supplier_id, ()))
+
+    # --- Построение из закупок ---
+    @staticmethod
+    def supplier_ids_by_name(suppliers) -> dict:
+        """
+        Нормализованное имя -> supplier_id (по тем же правилам, что и уникальность name)
+        """
+        return {Supplier_rep_base._norm_text(s.name): s.supplier_id for s in suppliers}
+
+    def add_purchases(self, purchases, supplier_ids: dict) -> set:
+        """
+        Добавляет предложения из фактов закупок. supplier_ids — результат supplier_ids_by_name.
+        Для пары (артикул, поставщик) берётся цена самой поздней закупки.
+        Возвращает имена поставщиков, которых нет в supplier_ids (их закупки пропущены).
+        """
+        latest = {}
+        unknown = set()
+        for p in purchases:
+            supplier_id = supplier_ids.get(Supplier_rep_base._norm_text(p.supplier_name))
+            if supplier_id is None:
+                unknown.add(p.supplier_name)
+                continue
+            key = (p.part_article, supplier_id)
+            seen = latest.get(key)
+            if seen is None or p.purchase_date >= seen[0]:
+                latest[key] = (p.purchase_date, p.part_price, p.part_name)
+
+        for (part_article, supplier_id), (_, part_price, part_name) in latest.items():
+            self.set_offer(part_article, supplier_id, part_price, part_name)
+        return unknown
+
+    @classmethod
+    def from_purchases(cls, purchases, suppliers) -> "PartCatalog":
+        """
+        suppliers — объекты Supplier (например, repo.read_all())
+        """
+        catalog = cls()
+        catalog.add_purchases(purchases, cls.supplier_ids_by_name(suppliers))
+        return catalog
+
+    # --- Хранение ---
+    def to_records(self) -> list:
+        return [
+            {
+                "part_article": part_article,
+                "part_name": self._part_names.get(part_article),
+                "supplier_id": supplier_id,
+                "part_price": price
+            }
+            for part_article in self._articles
+            for supplier_id, price in sorted(self._offers[part_article].items())
+        ]
+
+    def save(self, file_path: str) -> None:
+        """
+        Атомарная запись (atomic_open)
+        """
+        with atomic_open(file_path) as file:
+            json.dump(self.to_records(), file, ensure_ascii=False, indent=4)
+
+    @classmethod
+    def load(cls, file_path: str) -> "PartCatalog":
+        catalog = cls()
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                records = json.load(file)
+        except FileNotFoundError:
+            return catalog
+
+        records.sort(key=lambda r: r["part_article"])
+        for r in records:
+            # записи отсортированы, поэтому insort в set_offer добавляет в конец
+            catalog.set_offer(r["part_article"], r["supplier_id"], r["part_price"], r.get("part_name"))
+        return catalog
+
+    def __repr__(self):
+        return f"PartCatalog(articles={len(self)})"
@@ -0,0 +1,299 @@
+import json
+from datetime import date, datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8192)
+def _parse_date(date_str: str) -> date:
+    """
+    Разбор даты "дд.мм.гггг". В выгрузках закупок дат немного (по одной на день),
+    поэтому strptime вызывается один раз на каждую различную строку.
+    """
+    return datetime.strptime(date_str, "%d.%m.%Y").date()
+
+
+class PurchaseErrors(list):
+    """
+    Ограниченный журнал плохих строк для Purchase.iter_values_*: хранит только первые
+    limit записей {"line", "error", "data"}, а total считает все плохие строки.
+    Обычный список вместо него тоже ограничивается — первыми Purchase.MAX_ERRORS записями.
+    """
+
+    def __init__(self, limit: int = 1000):
+        super().__init__()
+        self.limit = limit
+        self.total = 0
+
+    def __repr__(self):
+        return f"PurchaseErrors(total={self.total}, kept={len(self)})"
+
+
+class PurchaseBase:
+    possible_keys = ('supplier_name', 'part_article', 'part_name', 'quantity')
+
+    def __init__(self, supplier_name, part_article, part_name, quantity):
+        self.supplier_name = supplier_name
+        self.part_article = part_article
+        self.part_name = part_name
+        self.quantity = quantity
+
+    @staticmethod
+    def validate_text_field(value):
+        if not value or not isinstance(value, str):
+            raise ValueError("Поле должно быть непустой строкой")
+        return value.strip()
+
+    @staticmethod
+    def validate_quantity(value):
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError("Количество должно быть положительным целым числом")
+        return value
+
+    @property
+    def supplier_name(self):
+        return self._supplier_name
+
+    @supplier_name.setter
+    def supplier_name(self, value):
+        self._supplier_name = self.validate_text_field(value)
+
+    @property
+    def part_article(self):
+        return self._part_article
+
+    @part_article.setter
+    def part_article(self, value):
+        self._part_article = self.validate_text_field(value)
+
+    @property
+    def part_name(self):
+        return self._part_name
+
+    @part_name.setter
+    def part_name(self, value):
+        self._part_name = self.validate_text_field(value)
+
+    @property
+    def quantity(self):
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, value):
+        self._quantity = self.validate_quantity(value)
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Быстрое создание объекта из доверенного кортежа в порядке possible_keys
+        (например, строки PurchaseLedger): без валидаторов.
+        """
+        obj = cls.__new__(cls)
+        for k, v in zip(cls.possible_keys, row):
+            setattr(obj, '_' + k, v)
+        return obj
+
+    def identity(self) -> tuple:
+        """
+        Значения всех полей possible_keys: по ним объекты сравниваются и хешируются.
+        У Purchase это ещё цена и дата, поэтому Purchase и PurchaseSummary
+        с одинаковыми общими полями не равны.
+        """
+        return tuple(getattr(self, '_' + k) for k in self.possible_keys)
+
+    def __eq__(self, other):
+        if not isinstance(other, PurchaseBase) or self.possible_keys != other.possible_keys:
+            return False
+        return self.identity() == other.identity()
+
+    def __hash__(self):
+        # объект изменяем: после смены полей в set/dict его уже не найти
+        return hash((self.possible_keys, self.identity()))
+
+
+class PurchaseSummary(PurchaseBase):
+    def __str__(self):
+        return (f"Закупка (кратко): {self.part_name} (арт. {self.part_article})\n"
+                f"Поставщик: {self.supplier_name}\n"
+                f"Количество: {self.quantity} шт.")
+
+    def __repr__(self):
+        return (f"PurchaseSummary({self.supplier_name!r}, {self.part_article!r}, "
+                f"{self.part_name!r}, {self.quantity})")
+
+    @classmethod
+    def from_purchase(cls, purchase_obj):
+        return cls(
+            supplier_name=purchase_obj.supplier_name,
+            part_article=purchase_obj.part_article,
+            part_name=purchase_obj.part_name,
+            quantity=purchase_obj.quantity
+        )
+
+class Purchase(PurchaseBase):
+    possible_keys = ('supplier_name', 'part_article', 'part_name', 'part_price', 'quantity', 'purchase_date')
+
+    def __init__(self, supplier_name, part_article, part_name, part_price, quantity, purchase_date):
+        super().__init__(supplier_name, part_article, part_name, quantity)
+        self.part_price = part_price
+        self.purchase_date = purchase_date
+
+    @staticmethod
+    def validate_price(value):
+        if not isinstance(value, (int, float)) or value <= 0:
+            raise ValueError("Цена должна быть положительным числом")
+        return float(value)
+
+    @staticmethod
+    def validate_date(value):
+        if not isinstance(value, date):
+            raise ValueError("Дата должна быть объектом datetime.date")
+        if value > date.today():
+            raise ValueError("Дата не может быть в будущем")
+        return value
+
+    @property
+    def part_price(self):
+        return self._part_price
+
+    @part_price.setter
+    def part_price(self, value):
+        self._part_price = self.validate_price(value)
+
+    @property
+    def purchase_date(self):
+        return self._purchase_date
+
+    @purchase_date.setter
+    def purchase_date(self, value):
+        self._purchase_date = self.validate_date(value)
+
+    def get_total_cost(self):
+        return self.quantity * self.part_price
+
+    def __str__(self):
+        return (f"Закупка: {self.part_name} (арт. {self.part_article})\n"
+                f"Поставщик: {self.supplier_name}\n"
+                f"Количество: {self.quantity} шт. × {self.part_price} руб.\n"
+                f"Общая стоимость: {self.get_total_cost()} руб.\n"
+                f"Дата: {self.purchase_date.strftime('%d.%m.%Y')}")
+
+    def __repr__(self):
+        return (f"Purchase({self.supplier_name!r}, {self.part_article!r}, {self.part_name!r}, "
+                f"{self.part_price}, {self.quantity}, {self.purchase_date!r})")
+
+    @classmethod
+    def from_string(cls, data_str):
+        parts = data_str.split(';')
+        if len(parts) != 6:
+            raise ValueError("Строка должна содержать 6 полей, разделённых ';'")
+        supplier, article, name, price, quantity, date_str = parts
+        purchase_date = _parse_date(date_str)
+        return cls(supplier, article, name, float(price), int(quantity), purchase_date)
+
+    @classmethod
+    def from_json(cls, json_str):
+        data = json.loads(json_str)
+        purchase_date = _parse_date(data['purchase_date'])
+        return cls(
+            data['supplier_name'],
+            data['part_article'],
+            data['part_name'],
+            float(data['part_price']),
+            int(data['quantity']),
+            purchase_date
+        )
+
+    # --- Потоковое чтение больших выгрузок ---
+    @classmethod
+    def _checked_values(cls, supplier, article, name, price, quantity, date_str, today) -> tuple:
+        """
+        Те же проверки, что и в сеттерах, но без создания объекта.
+        Возвращает кортеж в порядке possible_keys.
+        """
+        purchase_date = _parse_date(date_str)
+        if purchase_date > today:
+            raise ValueError("Дата не может быть в будущем")
+        return (
+            cls.validate_text_field(supplier),
+            cls.validate_text_field(article),
+            cls.validate_text_field(name),
+            cls.validate_price(float(price)),
+            cls.validate_quantity(int(quantity)),
+            purchase_date
+        )
+
+    # сколько плохих строк сохраняется в обычный список errors (см. PurchaseErrors)
+    MAX_ERRORS = 1000
+
+    @classmethod
+    def _report(cls, errors, line_no: int, line: str, e: Exception) -> None:
+        if errors is None:
+            return
+        if isinstance(errors, PurchaseErrors):
+            errors.total += 1
+            limit = errors.limit
+        else:
+            limit = cls.MAX_ERRORS
+        if len(errors) < limit:
+            message = f"Отсутствует поле {e}" if isinstance(e, KeyError) else str(e)
+            errors.append({"line": line_no, "error": message, "data": line})
+
+    @classmethod
+    def iter_values_from_lines(cls, file, errors: list | None = None):
+        """
+        Построчный разбор выгрузки в формате from_string: выдаёт проверенные кортежи
+        (supplier_name, part_article, part_name, part_price, quantity, purchase_date).
+        Плохие строки пропускаются; если передан errors, туда дописывается
+        {"line", "error", "data"} — не больше лимита (PurchaseErrors: первые limit записей
+        и общее число в total). Файл не читается целиком.
+        """
+        today = date.today()
+        for line_no, line in enumerate(file, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            try:
+                parts = line.split(';')
+                if len(parts) != 6:
+                    raise ValueError("Строка должна содержать 6 полей, разделённых ';'")
+                values = cls._checked_values(*parts, today)
+            except (ValueError, TypeError) as e:
+                cls._report(errors, line_no, line, e)
+                continue
+            yield values
+
+    @classmethod
+    def iter_values_from_jsonl(cls, file, errors: list | None = None):
+        """
+        То же для JSON Lines: один объект from_json на строку
+        """
+        today = date.today()
+        decode = json.JSONDecoder().decode
+        for line_no, line in enumerate(file, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            try:
+                data = decode(line)
+                values = cls._checked_values(
+                    data['supplier_name'], data['part_article'], data['part_name'],
+                    data['part_price'], data['quantity'], data['purchase_date'], today
+                )
+            except (ValueError, TypeError, KeyError) as e:
+                cls._report(errors, line_no, line, e)
+                continue
+            yield values
+
+    @classmethod
+    def iter_from_lines(cls, file, errors: list | None = None):
+        """
+        Объекты Purchase из выгрузки в формате from_string (поля уже проверены)
+        """
+        return map(cls.from_row, cls.iter_values_from_lines(file, errors))
+
+    @classmethod
+    def iter_from_jsonl(cls, file, errors: list | None = None):
+        """
+        Объекты Purchase из выгрузки JSON Lines (поля уже проверены)
+        """
+        return map(cls.from_row, cls.iter_values_from_jsonl(file, errors))
@@ -0,0 +1,241 @@
+import marshal
+from datetime import date
+from Supplier_rep_base import atomic_open
+
+
+class AggregateBucket:
+    """
+    Накопленные итоги по группе закупок
+    """
+
+    __slots__ = ('cost', 'quantity', 'count', 'min_price', 'max_price')
+
+    def __init__(self):
+        self.cost = 0.0
+        self.quantity = 0
+        self.count = 0
+        self.min_price = None
+        self.max_price = None
+
+    def add(self, part_price: float, quantity: int) -> None:
+        self.cost += part_price * quantity
+        self.quantity += quantity
+        self.count += 1
+        if self.min_price is None or part_price < self.min_price:
+            self.min_price = part_price
+        if self.max_price is None or part_price > self.max_price:
+            self.max_price = part_price
+
+    def merge(self, other: "AggregateBucket") -> None:
+        self.cost += other.cost
+        self.quantity += other.quantity
+        self.count += other.count
+        if other.min_price is not None and (self.min_price is None or other.min_price < self.min_price):
+            self.min_price = other.min_price
+        if other.max_price is not None and (self.max_price is None or other.max_price > self.max_price):
+            self.max_price = other.max_price
+
+    def to_tuple(self) -> tuple:
+        return self.cost, self.quantity, self.count, self.min_price, self.max_price
+
+    @classmethod
+    def from_tuple(cls, values) -> "AggregateBucket":
+        bucket = cls()
+        bucket.cost, bucket.quantity, bucket.count, bucket.min_price, bucket.max_price = values
+        return bucket
+
+    def to_dict(self) -> dict:
+        return {
+            "cost": self.cost,
+            "quantity": self.quantity,
+            "count": self.count,
+            "min_price": self.min_price,
+            "max_price": self.max_price
+        }
+
+    def __repr__(self):
+        return (f"AggregateBucket(cost={self.cost}, quantity={self.quantity}, count={self.count}, "
+                f"min_price={self.min_price}, max_price={self.max_price})")
+
+
+class PurchaseAggregates:
+    """
+    Итоги закупок (сумма, количество, число фактов, мин./макс. цена), которые
+    обновляются при каждом добавлении факта — отчёты читают O(корзин), а не O(закупок).
+
+    Корзины ведутся по (поставщик, артикул, месяц) и свёрнуты по измерениям:
+    поставщик -> месяц, артикул -> месяц, (поставщик, артикул) -> месяц, месяц.
+    Месяц задаётся кортежем (год, месяц); диапазон месяцев — включительно с обеих сторон.
+
+    applied — сколько фактов уже учтено; после перезапуска итоги восстанавливаются
+    из снимка (load), а недостающий хвост PurchaseLedger дочитывается через catch_up.
+    """
+
+    _SNAPSHOT_FORMAT = 1
+
+    def __init__(self):
+        self.applied = 0
+        self._cells = {}
+        self._by_supplier = {}
+        self._by_article = {}
+        self._by_pair = {}
+        self._by_month = {}
+        self._month_of_day = {}
+
+    @staticmethod
+    def _month_key(year: int, month: int) -> int:
+        return year * 12 + month - 1
+
+    @staticmethod
+    def _month_of_key(key: int) -> tuple:
+        return key // 12, key % 12 + 1
+
+    @staticmethod
+    def _bucket(index: dict, key) -> AggregateBucket:
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = AggregateBucket()
+        return bucket
+
+    # --- Обновление ---
+    def _add_cell(self, supplier_name: str, part_article: str, month: int, cell: AggregateBucket) -> None:
+        """
+        Вливает итоги ячейки во все свёртки
+        """
+        self._bucket(self._by_supplier.setdefault(supplier_name, {}), month).merge(cell)
+        self._bucket(self._by_article.setdefault(part_article, {}), month).merge(cell)
+        self._bucket(self._by_pair.setdefault((supplier_name, part_article), {}), month).merge(cell)
+        self._bucket(self._by_month, month).merge(cell)
+
+    def add_values(self, supplier_name: str, part_article: str, part_name: str,
+                   part_price: float, quantity: int, purchase_day: int) -> None:
+        """
+        Учитывает один факт; аргументы — как у PurchaseLedger.append_values
+        """
+        month = self._month_of_day.get(purchase_day)
+        if month is None:
+            d = date.fromordinal(purchase_day)
+            month = self._month_of_day[purchase_day] = self._month_key(d.year, d.month)
+        self._bucket(self._cells, (supplier_name, part_article, month)).add(part_price, quantity)
+        for bucket in (
+            self._bucket(self._by_supplier.setdefault(supplier_name, {}), month),
+            self._bucket(self._by_article.setdefault(part_article, {}), month),
+            self._bucket(self._by_pair.setdefault((supplier_name, part_article), {}), month),
+            self._bucket(self._by_month, month),
+        ):
+            bucket.add(part_price, quantity)
+        self.applied += 1
+
+    def add(self, purchase) -> None:
+        self.add_values(
+            purchase.supplier_name, purchase.part_article, purchase.part_name,
+            purchase.part_price, purchase.quantity, purchase.purchase_date.toordinal()
+        )
+
+    def catch_up(self, ledger) -> int:
+        """
+        Учитывает строки ledger, добавленные после последнего учтённого факта.
+        Возвращает количество учтённых строк.
+        """
+        start = self.applied
+        for i in range(start, len(ledger)):
+            self.add_values(
+                ledger.supplier_name[i], ledger.part_article[i], ledger.part_name[i],
+                ledger.part_price[i], ledger.quantity[i], ledger.purchase_day[i]
+            )
+        return self.applied - start
+
+    @classmethod
+    def from_ledger(cls, ledger) -> "PurchaseAggregates":
+        aggregates = cls()
+        aggregates.catch_up(ledger)
+        return aggregates
+
+    # --- Запросы ---
+    def _range(self, start, end):
+        lo = self._month_key(*start) if start is not None else None
+        hi = self._month_key(*end) if end is not None else None
+        return lambda month: (lo is None or month >= lo) and (hi is None or month <= hi)
+
+    @staticmethod
+    def _sum(months: dict, in_range) -> AggregateBucket:
+        total = AggregateBucket()
+        for month, bucket in months.items():
+            if in_range(month):
+                total.merge(bucket)
+        return total
+
+    def total(self, supplier_name: str | None = None, part_article: str | None = None,
+              start: tuple | None = None, end: tuple | None = None) -> AggregateBucket:
+        """
+        Итоги с необязательными фильтрами по поставщику, артикулу и диапазону месяцев
+        (для одного месяца — start=end=(год, месяц), см. month).
+        """
+        if supplier_name is not None and part_article is not None:
+            months = self._by_pair.get((supplier_name, part_article), {})
+        elif supplier_name is not None:
+            months = self._by_supplier.get(supplier_name, {})
+        elif part_article is not None:
+            months = self._by_article.get(part_article, {})
+        else:
+            months = self._by_month
+        return self._sum(months, self._range(start, end))
+
+    def month(self, year: int, month: int, supplier_name: str | None = None,
+              part_article: str | None = None) -> AggregateBucket:
+        return self.total(supplier_name, part_article, (year, month), (year, month))
+
+    def by_supplier(self, start: tuple | None = None, end: tuple | None = None) -> dict:
+        """
+        Поставщик -> итоги за диапазон месяцев ("расходы по поставщикам за квартал")
+        """
+        in_range = self._range(start, end)
+        result = {name: self._sum(months, in_range) for name, months in self._by_supplier.items()}
+        return {name: bucket for name, bucket in result.items() if bucket.count}
+
+    def by_article(self, start: tuple | None = None, end: tuple | None = None) -> dict:
+        in_range = self._range(start, end)
+        result = {article: self._sum(months, in_range) for article, months in self._by_article.items()}
+        return {article: bucket for article, bucket in result.items() if bucket.count}
+
+    def by_month(self, start: tuple | None = None, end: tuple | None = None) -> dict:
+        in_range = self._range(start, end)
+        return {
+            self._month_of_key(month): AggregateBucket.from_tuple(bucket.to_tuple())
+            for month, bucket in sorted(self._by_month.items())
+            if in_range(month)
+        }
+
+    # --- Снимок ---
+    def save(self, file_path: str) -> None:
+        """
+        Компактный снимок (marshal): только ячейки (поставщик, артикул, месяц),
+        свёртки пересчитываются при загрузке. Запись атомарная (atomic_open).
+        """
+        cells = [(s, a, m, *bucket.to_tuple()) for (s, a, m), bucket in self._cells.items()]
+        with atomic_open(file_path, "wb") as file:
+            marshal.dump((self._SNAPSHOT_FORMAT, self.applied, cells), file)
+
+    @classmethod
+    def load(cls, file_path: str) -> "PurchaseAggregates":
+        """
+        Восстанавливает итоги из снимка; если снимка нет или он другого формата — пустые итоги
+        """
+        aggregates = cls()
+        try:
+            with open(file_path, "rb") as file:
+                fmt, applied, cells = marshal.load(file)
+        except (FileNotFoundError, EOFError, ValueError, TypeError):
+            return aggregates
+        if fmt != cls._SNAPSHOT_FORMAT:
+            return aggregates
+
+        aggregates.applied = applied
+        for supplier_name, part_article, month, *values in cells:
+            cell = AggregateBucket.from_tuple(values)
+            aggregates._cells[(supplier_name, part_article, month)] = cell
+            aggregates._add_cell(supplier_name, part_article, month, cell)
+        return aggregates
+
+    def __repr__(self):
+        return f"PurchaseAggregates(applied={self.applied}, cells={len(self._cells)})"
@@ -0,0 +1,203 @@
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import shutil
+import tempfile
+
+
+class _BloomFilter:
+    """
+    Фильтр Блума по 16-байтным отпечаткам: k позиций получаются двойным хешированием
+    из двух половин отпечатка, поэтому повторно хешировать не нужно.
+    """
+
+    def __init__(self, expected_items: int, fp_rate: float):
+        expected_items = max(expected_items, 1)
+        self.size = max(8, int(-expected_items * math.log(fp_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.size / expected_items * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, fp: bytes):
+        h1 = int.from_bytes(fp[:8], "little")
+        h2 = int.from_bytes(fp[8:], "little") | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.k)]
+
+    def add(self, fp: bytes) -> None:
+        bits = self.bits
+        for pos in self._positions(fp):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, fp: bytes) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(fp))
+
+
+class _Run:
+    """
+    Отсортированный файл отпечатков на диске (по RECORD байт), поиск — двоичный через mmap
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = len(self._map) // PurchaseDeduplicator.RECORD
+
+    def __contains__(self, fp: bytes) -> bool:
+        size = PurchaseDeduplicator.RECORD
+        m = self._map
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = m[mid * size:(mid + 1) * size]
+            if probe < fp:
+                lo = mid + 1
+            elif probe > fp:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __iter__(self):
+        size = PurchaseDeduplicator.RECORD
+        m = self._map
+        for i in range(self.count):
+            yield m[i * size:(i + 1) * size]
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+class PurchaseDeduplicator:
+    """
+    Потоковое удаление повторов из выгрузок закупок за один проход.
+
+    Факт определяется Purchase.identity() (все поля, включая цену и дату);
+    в памяти хранится только 16-байтный отпечаток blake2b. Точное множество
+    отпечатков в памяти ограничено max_memory_keys: при переполнении оно
+    сбрасывается на диск отсортированным файлом (run). Перед поиском по файлам
+    проверяется фильтр Блума по всем сброшенным отпечаткам, поэтому диск читается
+    только для повторов и редких ложных срабатываний (fp_rate).
+    Когда файлов больше max_runs, они сливаются в один.
+
+    Ложных срабатываний в итоге нет: фильтр Блума лишь отсекает заведомо новые факты.
+    """
+
+    RECORD = 16
+
+    def __init__(self, max_memory_keys: int = 500_000, expected_items: int = 10_000_000,
+                 fp_rate: float = 0.01, max_runs: int = 8, spill_dir: str | None = None):
+        self.max_memory_keys = max_memory_keys
+        self.max_runs = max_runs
+        self.spill_dir = spill_dir
+        self._tmp_dir = None
+        self._memory = set()
+        self._runs = []
+        self._bloom = _BloomFilter(expected_items, fp_rate)
+        self._run_no = 0
+
+        self.unique = 0
+        self.duplicates = 0
+
+    @classmethod
+    def fingerprint(cls, values) -> bytes:
+        """
+        Отпечаток значений факта (кортеж identity() или строка Purchase.iter_values_*)
+        """
+        text = "\x1f".join(map(str, values))
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=cls.RECORD).digest()
+
+    # --- Проверка ---
+    def _seen(self, fp: bytes) -> bool:
+        if fp in self._memory:
+            return True
+        if self._runs and fp in self._bloom:
+            return any(fp in run for run in self._runs)
+        return False
+
+    def add_values(self, values) -> bool:
+        """
+        True, если факт встретился впервые (и теперь запомнен), False — повтор
+        """
+        fp = self.fingerprint(values)
+        if self._seen(fp):
+            self.duplicates += 1
+            return False
+
+        self._memory.add(fp)
+        self.unique += 1
+        if len(self._memory) >= self.max_memory_keys:
+            self._spill()
+        return True
+
+    def add(self, purchase) -> bool:
+        return self.add_values(purchase.identity())
+
+    def filter(self, purchases):
+        """
+        Пропускает только первые вхождения фактов
+        """
+        add = self.add
+        for p in purchases:
+            if add(p):
+                yield p
+
+    def filter_values(self, rows):
+        """
+        То же для кортежей Purchase.iter_values_from_lines / iter_values_from_jsonl
+        """
+        add_values = self.add_values
+        for row in rows:
+            if add_values(row):
+                yield row
+
+    # --- Сброс на диск ---
+    def _new_run_path(self) -> str:
+        if self._tmp_dir is None:
+            self._tmp_dir = tempfile.mkdtemp(prefix="purchase_dedup_", dir=self.spill_dir)
+        self._run_no += 1
+        return os.path.join(self._tmp_dir, f"run_{self._run_no:06d}.bin")
+
+    def _write_run(self, fingerprints) -> None:
+        path = self._new_run_path()
+        with open(path, "wb") as file:
+            for fp in fingerprints:
+                file.write(fp)
+        self._runs.append(_Run(path))
+
+    def _spill(self) -> None:
+        for fp in self._memory:
+            self._bloom.add(fp)
+        self._write_run(sorted(self._memory))
+        self._memory = set()
+
+        if len(self._runs) > self.max_runs:
+            runs, self._runs = self._runs, []
+            # повторов между файлами нет: в файл попадают только новые отпечатки
+            self._write_run(heapq.merge(*runs))
+            for run in runs:
+                run.close()
+                os.remove(run.path)
+
+    def close(self) -> None:
+        for run in self._runs:
+            run.close()
+        self._runs = []
+        self._memory = set()
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return (f"PurchaseDeduplicator(unique={self.unique}, duplicates={self.duplicates}, "
+                f"in_memory={len(self._memory)}, runs={len(self._runs)})")
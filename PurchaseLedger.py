@@ -0,0 +1,206 @@
+from array import array
+from datetime import date
+from operator import mul
+from Purchase import Purchase
+from SupplierTable import _DictColumn
+
+
+class PurchaseLedger:
+    """
+    Колоночное хранилище фактов закупок (десятки миллионов строк).
+
+    Колонки — типизированные массивы: цена — float64, количество — int64,
+    дата — номер дня (date.toordinal()) в int32; поставщик, артикул и наименование
+    детали — со словарным кодированием (каждая строка хранит только код).
+    Агрегаты считаются проходом по массивам, без создания объектов Purchase.
+    Если значение не помещается в колонку, строка не добавляется ни в одну из колонок.
+
+    Если передан aggregates (PurchaseAggregates), каждый добавленный факт сразу
+    учитывается и в его итогах.
+    """
+
+    columns = Purchase.possible_keys
+
+    def __init__(self, aggregates=None):
+        self.aggregates = aggregates
+        self.supplier_name = _DictColumn()
+        self.part_article = _DictColumn()
+        self.part_name = _DictColumn()
+        self.part_price = array('d')
+        self.quantity = array('q')
+        self.purchase_day = array('i')
+
+    # --- Загрузка ---
+    def append_values(self, supplier_name: str, part_article: str, part_name: str,
+                      part_price: float, quantity: int, purchase_day: int) -> None:
+        """
+        Добавление уже проверенных значений (дата — номер дня date.toordinal())
+        """
+        start = len(self)
+        try:
+            # сначала типизированные колонки: они могут отклонить значение (OverflowError/TypeError)
+            self.part_price.append(part_price)
+            self.quantity.append(quantity)
+            self.purchase_day.append(purchase_day)
+            self.supplier_name.append(supplier_name)
+            self.part_article.append(part_article)
+            self.part_name.append(part_name)
+        except BaseException:
+            self._truncate(start)
+            raise
+        if self.aggregates is not None:
+            self.aggregates.add_values(supplier_name, part_article, part_name, part_price, quantity, purchase_day)
+
+    def append(self, purchase: Purchase) -> None:
+        self.append_values(
+            purchase.supplier_name, purchase.part_article, purchase.part_name,
+            purchase.part_price, purchase.quantity, purchase.purchase_date.toordinal()
+        )
+
+    def extend(self, purchases) -> None:
+        """
+        Массовое добавление: числовые колонки дописываются одним вызовом array.extend.
+        Числа собираются в массивы того же типа заранее, поэтому значение, не помещающееся
+        в колонку, отклоняет всю пачку до изменения колонок.
+        """
+        names = []
+        prices = array(self.part_price.typecode)
+        quantities = array(self.quantity.typecode)
+        days = array(self.purchase_day.typecode)
+        for p in purchases:
+            names.append((p.supplier_name, p.part_article, p.part_name))
+            prices.append(p.part_price)
+            quantities.append(p.quantity)
+            days.append(p.purchase_date.toordinal())
+
+        start = len(self)
+        try:
+            for supplier_name, part_article, part_name in names:
+                self.supplier_name.append(supplier_name)
+                self.part_article.append(part_article)
+                self.part_name.append(part_name)
+        except BaseException:
+            self._truncate(start)
+            raise
+        self.part_price.extend(prices)
+        self.quantity.extend(quantities)
+        self.purchase_day.extend(days)
+        if self.aggregates is not None:
+            for i in range(start, len(self)):
+                self.aggregates.add_values(
+                    self.supplier_name[i], self.part_article[i], self.part_name[i],
+                    self.part_price[i], self.quantity[i], self.purchase_day[i]
+                )
+
+    def extend_values(self, rows) -> None:
+        """
+        Добавление проверенных кортежей в порядке Purchase.possible_keys
+        (например, из Purchase.iter_values_from_lines) — без объектов Purchase
+        """
+        append = self.append_values
+        for supplier_name, part_article, part_name, part_price, quantity, purchase_date in rows:
+            append(supplier_name, part_article, part_name, part_price, quantity, purchase_date.toordinal())
+
+    def _truncate(self, size: int) -> None:
+        """
+        Откат частично добавленной строки: все колонки обрезаются до size строк
+        """
+        for col in (self.part_price, self.quantity, self.purchase_day):
+            del col[size:]
+        for col in (self.supplier_name, self.part_article, self.part_name):
+            del col.codes[size:]
+
+    @classmethod
+    def from_purchases(cls, purchases) -> "PurchaseLedger":
+        ledger = cls()
+        ledger.extend(purchases)
+        return ledger
+
+    @classmethod
+    def from_lines(cls, file, errors: list | None = None) -> "PurchaseLedger":
+        """
+        Загрузка выгрузки в формате Purchase.from_string; плохие строки — в errors
+        """
+        ledger = cls()
+        ledger.extend_values(Purchase.iter_values_from_lines(file, errors))
+        return ledger
+
+    @classmethod
+    def from_jsonl(cls, file, errors: list | None = None) -> "PurchaseLedger":
+        """
+        Загрузка выгрузки JSON Lines (объекты Purchase.from_json); плохие строки — в errors
+        """
+        ledger = cls()
+        ledger.extend_values(Purchase.iter_values_from_jsonl(file, errors))
+        return ledger
+
+    # --- Доступ ---
+    def __len__(self):
+        return len(self.part_price)
+
+    def row(self, i: int) -> Purchase:
+        return Purchase.from_row((
+            self.supplier_name[i], self.part_article[i], self.part_name[i],
+            self.part_price[i], self.quantity[i], date.fromordinal(self.purchase_day[i])
+        ))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    # --- Агрегаты ---
+    def _costs(self):
+        return map(mul, self.part_price, self.quantity)
+
+    @staticmethod
+    def _sum_by_code(codes, values, size: int) -> list:
+        totals = [0.0] * size
+        for code, value in zip(codes, values):
+            totals[code] += value
+        return totals
+
+    def _cost_by_column(self, col: _DictColumn) -> dict:
+        totals = self._sum_by_code(col.codes, self._costs(), len(col.values))
+        return dict(zip(col.values, totals))
+
+    def total_cost(self) -> float:
+        return sum(self._costs())
+
+    def total_cost_by_supplier(self) -> dict:
+        """
+        Поставщик -> сумма quantity * part_price
+        """
+        return self._cost_by_column(self.supplier_name)
+
+    def total_cost_by_article(self) -> dict:
+        """
+        Артикул -> сумма quantity * part_price
+        """
+        return self._cost_by_column(self.part_article)
+
+    def total_cost_by_month(self) -> dict:
+        """
+        (год, месяц) -> сумма quantity * part_price.
+        Номер дня переводится в месяц один раз на каждый различный день.
+        """
+        month_of_day = {}
+        month_codes = {}
+        months = []
+        codes = array('i')
+        for day in self.purchase_day:
+            code = month_of_day.get(day)
+            if code is None:
+                d = date.fromordinal(day)
+                code = month_codes.get((d.year, d.month))
+                if code is None:
+                    code = len(months)
+                    month_codes[(d.year, d.month)] = code
+                    months.append((d.year, d.month))
+                month_of_day[day] = code
+            codes.append(code)
+
+        totals = self._sum_by_code(codes, self._costs(), len(months))
+        return dict(sorted(zip(months, totals)))
+
+    def __repr__(self):
+        return f"PurchaseLedger(rows={len(self)})"
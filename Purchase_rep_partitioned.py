@@ -0,0 +1,261 @@
+import json
+import os
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import date
+from Purchase import Purchase, PurchaseErrors
+from PurchaseLedger import PurchaseLedger
+from Supplier_rep_base import atomic_open
+
+
+class _Partition:
+    """
+    Загруженная партиция: строки в PurchaseLedger и порядок строк по дате.
+    У закрытой партиции строки уже лежат по дате (order = None),
+    у открытой — в порядке поступления, а order хранит номера строк по дате.
+    """
+
+    def __init__(self, ledger: PurchaseLedger, sealed: bool, signature):
+        self.ledger = ledger
+        self.sealed = sealed
+        self.signature = signature
+        if sealed:
+            self.order = None
+        else:
+            day = ledger.purchase_day
+            self.order = sorted(range(len(ledger)), key=day.__getitem__)
+
+    def append_values(self, values: tuple) -> None:
+        ledger = self.ledger
+        ledger.extend_values((values,))
+        insort(self.order, len(ledger) - 1, key=ledger.purchase_day.__getitem__)
+
+    def row_range(self, lo_day: int, hi_day: int):
+        """
+        Номера строк с датой в [lo_day, hi_day] по возрастанию даты (двоичный поиск)
+        """
+        day = self.ledger.purchase_day
+        if self.order is None:
+            return range(bisect_left(day, lo_day), bisect_right(day, hi_day))
+        key = day.__getitem__
+        return self.order[bisect_left(self.order, lo_day, key=key):bisect_right(self.order, hi_day, key=key)]
+
+
+class Purchase_rep_partitioned:
+    """
+    Хранилище фактов закупок, разбитое по месяцам: одна партиция — один файл
+    JSON Lines (объекты в формате Purchase.from_json) в каталоге dir_path.
+
+    - <ГГГГ-ММ>.jsonl — открытая партиция, в неё дописываются новые факты;
+    - <ГГГГ-ММ>.sealed.jsonl — закрытая (seal): строки отсортированы по дате,
+      файл больше не меняется, поэтому после загрузки кэшируется без перепроверок.
+
+    Запрос по диапазону дат читает только партиции нужных месяцев и внутри каждой
+    ищет границы двоичным поиском. В памяти держится не больше cache_size партиций.
+    Список партиций кэшируется и перечитывается только при изменении каталога (mtime).
+    Строка партиции, которая не разбирается, — ValueError при загрузке партиции.
+    """
+
+    _FILE_RE = re.compile(r"^(\d{4})-(\d{2})(\.sealed)?\.jsonl$")
+
+    def __init__(self, dir_path: str, cache_size: int = 12):
+        self.dir_path = dir_path
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._partitions = None
+        self._partitions_key = None
+        os.makedirs(dir_path, exist_ok=True)
+
+    # --- Файлы партиций ---
+    def _path(self, month: tuple, sealed: bool) -> str:
+        suffix = ".sealed.jsonl" if sealed else ".jsonl"
+        return os.path.join(self.dir_path, f"{month[0]:04d}-{month[1]:02d}{suffix}")
+
+    def partitions(self) -> dict:
+        """
+        (год, месяц) -> закрыта ли партиция, по возрастанию месяца.
+        Каталог перечитывается, только если изменилась его сигнатура (mtime).
+        """
+        # сигнатура снимается ДО чтения каталога: изменение во время чтения заметит следующий вызов
+        key = self._signature(self.dir_path)
+        if self._partitions is None or key != self._partitions_key:
+            result = {}
+            for name in os.listdir(self.dir_path):
+                m = self._FILE_RE.match(name)
+                if m:
+                    month = (int(m.group(1)), int(m.group(2)))
+                    # закрытая версия пишется раньше, чем удаляется открытая, и главнее её
+                    result[month] = result.get(month, False) or bool(m.group(3))
+            self._partitions = dict(sorted(result.items()))
+            self._partitions_key = key
+        return dict(self._partitions)
+
+    @staticmethod
+    def _signature(path: str):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _to_line(values: tuple) -> str:
+        supplier_name, part_article, part_name, part_price, quantity, purchase_date = values
+        return json.dumps({
+            "supplier_name": supplier_name,
+            "part_article": part_article,
+            "part_name": part_name,
+            "part_price": part_price,
+            "quantity": quantity,
+            "purchase_date": purchase_date.strftime("%d.%m.%Y")
+        }, ensure_ascii=False) + "\n"
+
+    @staticmethod
+    def _values_of(purchase: Purchase) -> tuple:
+        return (purchase.supplier_name, purchase.part_article, purchase.part_name,
+                purchase.part_price, purchase.quantity, purchase.purchase_date)
+
+    # --- Кэш партиций ---
+    def _load(self, month: tuple, sealed: bool):
+        """
+        Партиция месяца из кэша или с диска (None, если её нет)
+        """
+        part = self._cache.get(month)
+        if part is not None:
+            if part.sealed and sealed:
+                self._cache.move_to_end(month)
+                return part
+            if not part.sealed and not sealed and part.signature == self._signature(self._path(month, False)):
+                self._cache.move_to_end(month)
+                return part
+
+        path = self._path(month, sealed)
+        signature = self._signature(path)
+        if signature is None:
+            self._cache.pop(month, None)
+            return None
+        errors = PurchaseErrors(limit=1)
+        with open(path, "r", encoding="utf-8") as file:
+            ledger = PurchaseLedger.from_jsonl(file, errors)
+        if errors:
+            first = errors[0]
+            raise ValueError(f"Партиция {path} повреждена: {errors.total} плохих строк, "
+                             f"первая — строка {first['line']}: {first['error']}")
+        part = _Partition(ledger, sealed, signature)
+
+        self._cache[month] = part
+        self._cache.move_to_end(month)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return part
+
+    # --- Запись ---
+    def append(self, purchase: Purchase) -> None:
+        self.extend((purchase,))
+
+    def extend(self, purchases) -> None:
+        """
+        Дописывает факты в партиции их месяцев (одна дозапись на партицию).
+        Запись в закрытую партицию — ValueError.
+        """
+        by_month = {}
+        for p in purchases:
+            d = p.purchase_date
+            by_month.setdefault((d.year, d.month), []).append(self._values_of(p))
+
+        sealed = self.partitions()
+        for month in by_month:
+            if sealed.get(month):
+                raise ValueError(f"Партиция {month[0]:04d}-{month[1]:02d} закрыта для записи")
+
+        for month, rows in by_month.items():
+            path = self._path(month, False)
+            part = self._cache.get(month)
+            fresh = part is not None and not part.sealed and part.signature == self._signature(path)
+
+            with open(path, "a", encoding="utf-8") as file:
+                file.write("".join(map(self._to_line, rows)))
+
+            if fresh:
+                for values in rows:
+                    part.append_values(values)
+                part.signature = self._signature(path)
+            else:
+                self._cache.pop(month, None)
+
+    def seal(self, year: int, month: int) -> bool:
+        """
+        Закрывает партицию: строки сортируются по дате и пишутся в .sealed.jsonl
+        (атомарно), открытый файл удаляется. Возвращает False, если закрывать нечего.
+        """
+        key = (year, month)
+        if self.partitions().get(key, True):
+            return False
+
+        part = self._load(key, False)
+        ledger = part.ledger
+        with atomic_open(self._path(key, True)) as file:
+            for i in part.order:
+                file.write(self._to_line((
+                    ledger.supplier_name[i], ledger.part_article[i], ledger.part_name[i],
+                    ledger.part_price[i], ledger.quantity[i], date.fromordinal(ledger.purchase_day[i])
+                )))
+
+        os.remove(self._path(key, False))
+        self._cache.pop(key, None)
+        return True
+
+    def seal_completed(self, today: date | None = None) -> list:
+        """
+        Закрывает все открытые партиции прошедших месяцев; возвращает закрытые месяцы
+        """
+        today = today or date.today()
+        current = (today.year, today.month)
+        return [
+            month for month, is_sealed in self.partitions().items()
+            if not is_sealed and month < current and self.seal(*month)
+        ]
+
+    # --- Чтение ---
+    def _iter_rows(self, start: date, end: date):
+        """
+        (партиция, номер строки) для фактов с датой в [start, end] по возрастанию даты
+        """
+        lo_day, hi_day = start.toordinal(), end.toordinal()
+        first, last = (start.year, start.month), (end.year, end.month)
+        for month, sealed in self.partitions().items():
+            if month < first or month > last:
+                continue
+            part = self._load(month, sealed)
+            if part is None:
+                continue
+            for i in part.row_range(lo_day, hi_day):
+                yield part, i
+
+    def iter_by_date(self, start: date, end: date):
+        """
+        Объекты Purchase с purchase_date в [start, end] (включительно), по возрастанию даты
+        """
+        for part, i in self._iter_rows(start, end):
+            yield part.ledger.row(i)
+
+    def find_by_date(self, start: date, end: date) -> list:
+        return list(self.iter_by_date(start, end))
+
+    def count_by_date(self, start: date, end: date) -> int:
+        return sum(1 for _ in self._iter_rows(start, end))
+
+    def total_cost_by_date(self, start: date, end: date) -> float:
+        total = 0.0
+        for part, i in self._iter_rows(start, end):
+            total += part.ledger.part_price[i] * part.ledger.quantity[i]
+        return total
+
+    def get_count(self) -> int:
+        count = 0
+        for month, sealed in self.partitions().items():
+            part = self._load(month, sealed)
+            if part is not None:
+                count += len(part.ledger)
+        return count
@@ -0,0 +1,252 @@
+from array import array
+from collections import Counter
+from functools import partial
+from itertools import compress
+from operator import eq
+from Supplier import Supplier
+
+
+class _DictColumn:
+    """
+    Колонка со словарным кодированием: каждое значение хранится один раз в values,
+    строки хранят только его номер (код) в массиве codes.
+    """
+
+    def __init__(self):
+        self.codes = array('l')
+        self.values = []
+        self._lookup = {}
+
+    def append(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self._lookup[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def code_of(self, value):
+        return self._lookup.get(value)
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def to_list(self):
+        return list(map(self.values.__getitem__, self.codes))
+
+    def take(self, indices):
+        col = _DictColumn()
+        col.values = list(self.values)
+        col._lookup = dict(self._lookup)
+        col.codes = array('l', map(self.codes.__getitem__, indices))
+        return col
+
+
+class _LazyColumns(dict):
+    """
+    Колонки таблицы-представления (SupplierTable.view): колонка собирается из исходной
+    таблицы по номерам строк order только при первом обращении к ней
+    """
+
+    def __init__(self, source: "SupplierTable", order: list):
+        super().__init__()
+        self.source = source
+        self.order = order
+
+    def __missing__(self, name):
+        col = SupplierTable._take_column(self.source._cols[name], self.order)
+        self[name] = col
+        return col
+
+
+class SupplierTable:
+    """
+    Колоночное представление каталога поставщиков для массовой аналитики.
+
+    Каждое поле Supplier хранится отдельной колонкой: supplier_id — массив int64,
+    city и name — со словарным кодированием, остальные — списки строк.
+    Фильтрация, сортировка, группировка и проекция работают по колонкам,
+    без создания объекта на каждую строку.
+    """
+
+    columns = Supplier.possible_keys
+    encoded_columns = ('name', 'city')
+
+    def __init__(self):
+        self._cols = {}
+        for name in self.columns:
+            if name == 'supplier_id':
+                self._cols[name] = array('q')
+            elif name in self.encoded_columns:
+                self._cols[name] = _DictColumn()
+            else:
+                self._cols[name] = []
+
+    # --- Загрузка ---
+    def append_record(self, record: dict) -> None:
+        for name in self.columns:
+            self._cols[name].append(record[name])
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Из сырых словарей (как в suppliers.json / suppliers.yaml)
+        """
+        table = cls()
+        for record in records:
+            table.append_record(record)
+        return table
+
+    @classmethod
+    def from_suppliers(cls, suppliers):
+        """
+        Из объектов Supplier (например, результат read_all любого репозитория)
+        """
+        table = cls()
+        for s in suppliers:
+            for name in cls.columns:
+                table._cols[name].append(getattr(s, name))
+        return table
+
+    @classmethod
+    def from_file(cls, file_path: str):
+        """
+        Из файла JSON/YAML напрямую (с учётом журнала изменений), без построения объектов Supplier
+        """
+        if file_path.endswith(".json"):
+            from Supplier_rep_json import Supplier_rep_json
+            repo = Supplier_rep_json(file_path)
+        else:
+            from Supplier_rep_yaml import Supplier_rep_yaml
+            repo = Supplier_rep_yaml(file_path)
+        return cls.from_records(repo.read_records())
+
+    # --- Доступ ---
+    def __len__(self):
+        cols = self._cols
+        if isinstance(cols, _LazyColumns):
+            return len(cols.order)
+        return len(cols['supplier_id'])
+
+    def column(self, name: str) -> list:
+        col = self._cols[name]
+        if isinstance(col, _DictColumn):
+            return col.to_list()
+        return list(col)
+
+    def row(self, i: int) -> Supplier:
+        cols = self._cols
+        if isinstance(cols, _LazyColumns):
+            return cols.source.row(cols.order[i])
+        return Supplier.from_row([self._cols[name][i] for name in self.columns])
+
+    def to_suppliers(self) -> list:
+        return [self.row(i) for i in range(len(self))]
+
+    @staticmethod
+    def _take_column(col, indices):
+        if isinstance(col, _DictColumn):
+            return col.take(indices)
+        if isinstance(col, array):
+            return array(col.typecode, map(col.__getitem__, indices))
+        return list(map(col.__getitem__, indices))
+
+    def _source_rows(self, indices) -> tuple:
+        """
+        (таблица с собранными колонками, номера строк в ней): у представления номера
+        переводятся через его перестановку, чтобы не собирать его колонки
+        """
+        indices = list(indices)
+        cols = self._cols
+        if isinstance(cols, _LazyColumns):
+            return cols.source, list(map(cols.order.__getitem__, indices))
+        return self, indices
+
+    def take(self, indices) -> "SupplierTable":
+        """
+        Новая таблица из строк с указанными номерами (в указанном порядке)
+        """
+        source, indices = self._source_rows(indices)
+        table = SupplierTable.__new__(SupplierTable)
+        table._cols = {name: self._take_column(source._cols[name], indices) for name in self.columns}
+        return table
+
+    def view(self, indices) -> "SupplierTable":
+        """
+        Как take, но без копирования: колонка собирается при первом обращении к ней
+        """
+        source, indices = self._source_rows(indices)
+        table = SupplierTable.__new__(SupplierTable)
+        table._cols = _LazyColumns(source, indices)
+        return table
+
+    # --- Операции ---
+    def filter_eq(self, name: str, value) -> "SupplierTable":
+        col = self._cols[name]
+        if isinstance(col, _DictColumn):
+            code = col.code_of(value)
+            if code is None:
+                return self.take(())
+            mask = map(partial(eq, code), col.codes)
+        else:
+            mask = map(partial(eq, value), col)
+        return self.take(compress(range(len(self)), mask))
+
+    def filter(self, name: str, predicate) -> "SupplierTable":
+        """
+        Фильтр по предикату над значениями колонки. Для словарных колонок
+        предикат вызывается один раз на каждое различное значение.
+        """
+        col = self._cols[name]
+        if isinstance(col, _DictColumn):
+            keep = [bool(predicate(v)) for v in col.values]
+            mask = map(keep.__getitem__, col.codes)
+        else:
+            mask = map(predicate, col)
+        return self.take(compress(range(len(self)), mask))
+
+    def argsort(self, name: str) -> list:
+        """
+        Устойчивая сортировка номеров строк по колонке.
+        Для словарных колонок — сортировка подсчётом по рангу кода: O(n + d log d).
+        """
+        col = self._cols[name]
+        if not isinstance(col, _DictColumn):
+            return sorted(range(len(self)), key=col.__getitem__)
+
+        order = sorted(range(len(col.values)), key=col.values.__getitem__)
+        buckets = [[] for _ in col.values]
+        for i, code in enumerate(col.codes):
+            buckets[code].append(i)
+        result = []
+        for code in order:
+            result.extend(buckets[code])
+        return result
+
+    def sort_by(self, name: str) -> "SupplierTable":
+        """
+        Отсортированное представление (view): копируются только номера строк
+        """
+        return self.view(self.argsort(name))
+
+    def count_by(self, name: str) -> dict:
+        """
+        Количество строк на каждое значение колонки ("сколько поставщиков в каждом городе")
+        """
+        col = self._cols[name]
+        if isinstance(col, _DictColumn):
+            return {col.values[code]: n for code, n in Counter(col.codes).items()}
+        return dict(Counter(col))
+
+    def project(self, *names) -> list:
+        """
+        Кортежи значений выбранных колонок по строкам
+        """
+        cols = [self.column(name) for name in names]
+        return list(zip(*cols))
+
+    def __repr__(self):
+        return f"SupplierTable(rows={len(self)})"
@@ -0,0 +1,294 @@
+"""
+Детерминированный генератор синтетических поставщиков (и закупок) для нагрузочных тестов.
+
+Один и тот же seed всегда даёт одни и те же данные. name/phone/email/inn уникальны
+по построению (с учётом нормализации _norm_*), а не «почти наверняка»: номер строки
+переводится в значение взаимно однозначной перестановкой, зависящей от seed.
+ИНН — валидные 10-значные и 12-значные (обе контрольные цифры, как в Supplier.validate_inn).
+
+Запись — потоком, без списка всех записей в памяти:
+
+    python Supplier_generator.py suppliers -n 1000000 --format json --out suppliers.json
+    python Supplier_generator.py suppliers -n 1000000 --format copy --out suppliers.copy
+    python Supplier_generator.py purchases -n 5000000 --suppliers 1000000 --format jsonl --out purchases.jsonl
+
+Файл COPY загружается в таблицу suppliers (Supplier_rep_DB_schema) так:
+    COPY suppliers (supplier_id, name, contact_name, phone, email, city, address, inn) FROM STDIN;
+    SELECT setval('suppliers_supplier_id_seq', (SELECT max(supplier_id) FROM suppliers));
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import sys
+from datetime import date
+from Purchase import Purchase
+from Supplier import Supplier
+
+CITIES = ("Москва", "Санкт-Петербург", "Тула", "Казань", "Новосибирск", "Рязань", "Самара",
+          "Пермь", "Екатеринбург", "Воронеж", "Омск", "Уфа")
+FORMS = ("ООО", "АО", "ЗАО", "ИП", "ПАО")
+WORDS = ("Авто", "Деталь", "Запчасть", "Мотор", "Привод", "Снаб", "Торг", "Партс", "Ресурс", "Комплект")
+STREETS = ("ул. Ленина", "ул. Мира", "пр. Победы", "ул. Гагарина", "ул. Садовая", "ул. Заводская")
+SURNAMES = ("Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Волков", "Соколов")
+PARTS = ("Фильтр", "Свеча", "Колодка", "Ремень", "Подшипник", "Амортизатор", "Насос", "Датчик")
+
+INN10_CTRL = [2, 4, 10, 3, 5, 9, 4, 6, 8]
+INN12_CTRL_11 = [7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
+INN12_CTRL_12 = [3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
+
+# COPY-колонки таблицы suppliers (supplier_id задаётся явно, как в файловых репозиториях)
+COPY_COLUMNS = ("supplier_id",) + tuple(k for k in Supplier.possible_keys if k != "supplier_id")
+
+
+def inn_10(body: int) -> str:
+    """
+    Валидный 10-значный ИНН из 9 значащих цифр body (< 10**9)
+    """
+    digits = [int(ch) for ch in f"{body:09d}"]
+    digits.append(sum(d * c for d, c in zip(digits, INN10_CTRL)) % 11 % 10)
+    return "".join(map(str, digits))
+
+
+def inn_12(body: int) -> str:
+    """
+    Валидный 12-значный ИНН из 10 значащих цифр body (< 10**10): две контрольные цифры
+    """
+    digits = [int(ch) for ch in f"{body:010d}"]
+    digits.append(sum(d * c for d, c in zip(digits, INN12_CTRL_11)) % 11 % 10)
+    digits.append(sum(d * c for d, c in zip(digits, INN12_CTRL_12)) % 11 % 10)
+    return "".join(map(str, digits))
+
+
+class _Permutation:
+    """
+    Взаимно однозначное отображение [0, modulus) -> [0, modulus): i -> (a*i + b) mod modulus,
+    a взаимно просто с modulus. Разные i дают разные значения, порядок выглядит случайным.
+    """
+
+    def __init__(self, seed: int, salt: str, modulus: int):
+        h = hashlib.blake2b(f"{seed}:{salt}".encode("utf-8"), digest_size=16).digest()
+        a = int.from_bytes(h[:8], "little") % modulus or 1
+        while math.gcd(a, modulus) != 1:
+            a += 1
+        self.a = a
+        self.b = int.from_bytes(h[8:], "little") % modulus
+        self.modulus = modulus
+
+    def __call__(self, i: int) -> int:
+        return (self.a * i + self.b) % self.modulus
+
+
+class SupplierGenerator:
+    """
+    Поставщик номер i (0 <= i < 10**9) всегда один и тот же при том же seed.
+    inn12_share — доля поставщиков с 12-значным ИНН (выбирается детерминированно по i).
+    """
+
+    LIMIT = 10 ** 9
+
+    def __init__(self, seed: int = 0, start_id: int = 1, inn12_share: float = 0.3,
+                 email_domain: str = "example.ru"):
+        self.seed = seed
+        self.start_id = start_id
+        self.inn12_share = inn12_share
+        self.email_domain = email_domain
+        self._name = _Permutation(seed, "name", self.LIMIT)
+        self._phone = _Permutation(seed, "phone", self.LIMIT)
+        self._email = _Permutation(seed, "email", self.LIMIT)
+        self._inn10 = _Permutation(seed, "inn10", self.LIMIT)
+        self._inn12 = _Permutation(seed, "inn12", 10 ** 10)
+        self._kind = _Permutation(seed, "kind", 10 ** 6)
+
+    def record(self, i: int) -> dict:
+        """
+        Словарь поставщика в формате файлов репозиториев
+        """
+        if not 0 <= i < self.LIMIT:
+            raise ValueError(f"Номер поставщика должен быть в диапазоне [0, {self.LIMIT})")
+
+        kind = self._kind(i % 10 ** 6)
+        name_no = self._name(i)
+        phone_no = self._phone(i)
+        if kind < self.inn12_share * 10 ** 6:
+            inn = inn_12(self._inn12(i))
+        else:
+            inn = inn_10(self._inn10(i))
+
+        return {
+            "supplier_id": self.start_id + i,
+            "name": f"{FORMS[kind % len(FORMS)]} {WORDS[name_no % len(WORDS)]}{WORDS[kind // 7 % len(WORDS)].lower()} {name_no:09d}",
+            "contact_name": f"{SURNAMES[kind % len(SURNAMES)]} {chr(0x410 + kind % 32)}.{chr(0x410 + kind // 32 % 32)}.",
+            "phone": f"+7 9{phone_no // 10 ** 7:02d} {phone_no // 10 ** 4 % 1000:03d}-{phone_no // 100 % 100:02d}-{phone_no % 100:02d}",
+            "email": f"s{self._email(i):09d}@{self.email_domain}",
+            "city": CITIES[kind % len(CITIES)],
+            "address": f"{STREETS[kind % len(STREETS)]}, {kind % 200 + 1}",
+            "inn": inn,
+        }
+
+    def supplier(self, i: int) -> Supplier:
+        return Supplier.from_trusted(self.record(i))
+
+    def iter_records(self, n: int, start: int = 0):
+        for i in range(start, start + n):
+            yield self.record(i)
+
+    # --- Запись ---
+    def write_json(self, file, n: int) -> None:
+        """
+        JSON-массив в формате Supplier_rep_json (indent=4)
+        """
+        file.write("[")
+        for k, record in enumerate(self.iter_records(n)):
+            text = json.dumps(record, ensure_ascii=False, indent=4)
+            file.write(("\n" if k == 0 else ",\n") + "    " + text.replace("\n", "\n    "))
+        file.write("\n]\n" if n else "]\n")
+
+    def write_yaml(self, file, n: int, chunk_size: int = 10000) -> None:
+        """
+        YAML-список в формате Supplier_rep_yaml; сериализуется кусками по chunk_size
+        """
+        import yaml
+        from Supplier_rep_yaml import YamlDumper
+
+        if n == 0:
+            file.write("[]\n")
+            return
+        for start in range(0, n, chunk_size):
+            chunk = list(self.iter_records(min(chunk_size, n - start), start))
+            file.write(yaml.dump(chunk, Dumper=YamlDumper, allow_unicode=True, sort_keys=False))
+
+    @staticmethod
+    def _copy_escape(value) -> str:
+        # как Supplier_rep_DB._copy_escape (модуль БД без psycopg2 не импортируется)
+        return (str(value)
+                .replace("\\", "\\\\")
+                .replace("\t", "\\t")
+                .replace("\n", "\\n")
+                .replace("\r", "\\r"))
+
+    def write_copy(self, file, n: int) -> None:
+        """
+        Текстовый формат COPY для таблицы suppliers, колонки COPY_COLUMNS
+        """
+        escape = self._copy_escape
+        for record in self.iter_records(n):
+            file.write("\t".join(escape(record[c]) for c in COPY_COLUMNS) + "\n")
+
+
+class PurchaseGenerator:
+    """
+    Факты закупок у поставщиков SupplierGenerator с тем же seed.
+
+    У каждого поставщика articles_per_supplier артикулов из общего каталога из articles
+    артикулов, цена пары (поставщик, артикул) фиксирована (README); варьируются
+    количество и дата (от start до end включительно, end не позже сегодняшнего дня).
+    """
+
+    def __init__(self, suppliers: SupplierGenerator, supplier_count: int, articles: int = 10000,
+                 articles_per_supplier: int = 50, start: date = date(2023, 1, 1), end: date | None = None):
+        self.suppliers = suppliers
+        self.supplier_count = supplier_count
+        self.articles = articles
+        self.articles_per_supplier = articles_per_supplier
+        self.start = start
+        self.end = min(end or date.today(), date.today())
+        if self.start > self.end:
+            raise ValueError(f"Начало периода {self.start} позже его конца {self.end}")
+        seed = suppliers.seed
+        self._pick = _Permutation(seed, "purchase", 2 ** 61 - 1)
+        self._names = {}
+
+    def _supplier_name(self, s: int) -> str:
+        name = self._names.get(s)
+        if name is None:
+            if len(self._names) > 100000:
+                self._names.clear()
+            name = self._names[s] = self.suppliers.record(s)["name"]
+        return name
+
+    def values(self, i: int) -> tuple:
+        """
+        Кортеж закупки номер i в порядке Purchase.possible_keys
+        """
+        x = self._pick(i)
+        s = x % self.supplier_count
+        slot = x // self.supplier_count % self.articles_per_supplier
+        article_no = (s * 7919 + slot * 104729) % self.articles
+        price_seed = (s * 1000003 + article_no * 10007 + self.suppliers.seed) % 99991
+        days = (self.end - self.start).days + 1
+        return (
+            self._supplier_name(s),
+            f"A{article_no:06d}",
+            f"{PARTS[article_no % len(PARTS)]} {article_no}",
+            float(price_seed % 20000 + 50),
+            x // 7 % 20 + 1,
+            date.fromordinal(self.start.toordinal() + x // 11 % days),
+        )
+
+    def iter_values(self, n: int):
+        for i in range(n):
+            yield self.values(i)
+
+    def iter_purchases(self, n: int):
+        return map(Purchase.from_row, self.iter_values(n))
+
+    def write_lines(self, file, n: int) -> None:
+        """
+        Строки в формате Purchase.from_string
+        """
+        for values in self.iter_values(n):
+            *fields, purchase_date = values
+            fields[3] = f"{fields[3]:g}"
+            file.write(";".join(map(str, fields)) + ";" + purchase_date.strftime("%d.%m.%Y") + "\n")
+
+    def write_jsonl(self, file, n: int) -> None:
+        """
+        JSON Lines в формате Purchase.from_json
+        """
+        for supplier_name, part_article, part_name, part_price, quantity, purchase_date in self.iter_values(n):
+            file.write(json.dumps({
+                "supplier_name": supplier_name,
+                "part_article": part_article,
+                "part_name": part_name,
+                "part_price": part_price,
+                "quantity": quantity,
+                "purchase_date": purchase_date.strftime("%d.%m.%Y")
+            }, ensure_ascii=False) + "\n")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Генератор синтетических поставщиков и закупок")
+    sub = parser.add_subparsers(dest="what", required=True)
+
+    p_sup = sub.add_parser("suppliers")
+    p_sup.add_argument("--format", choices=("json", "yaml", "copy"), default="json")
+
+    p_pur = sub.add_parser("purchases")
+    p_pur.add_argument("--format", choices=("lines", "jsonl"), default="jsonl")
+    p_pur.add_argument("--suppliers", type=int, required=True, help="сколько поставщиков (как в suppliers -n)")
+    p_pur.add_argument("--articles", type=int, default=10000)
+
+    for p in (p_sup, p_pur):
+        p.add_argument("-n", type=int, required=True)
+        p.add_argument("--seed", type=int, default=0)
+        p.add_argument("--start-id", type=int, default=1)
+        p.add_argument("--out", help="файл (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    gen = SupplierGenerator(seed=args.seed, start_id=args.start_id)
+    out = open(args.out, "w", encoding="utf-8", newline="\n") if args.out else sys.stdout
+    try:
+        if args.what == "suppliers":
+            {"json": gen.write_json, "yaml": gen.write_yaml, "copy": gen.write_copy}[args.format](out, args.n)
+        else:
+            purchases = PurchaseGenerator(gen, args.suppliers, articles=args.articles)
+            {"lines": purchases.write_lines, "jsonl": purchases.write_jsonl}[args.format](out, args.n)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
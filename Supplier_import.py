@@ -0,0 +1,248 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from Supplier import Supplier
+from Supplier_rep_base import Supplier_rep_base
+
+
+def iter_json_array(file, read_size: int = 1 << 20):
+    """
+    Потоковый разбор JSON-массива: элементы выдаются по одному,
+    файл читается кусками по read_size символов, а не целиком.
+    Между элементами обязательны "," (или "]" после последнего);
+    обрыв или ошибка синтаксиса — ValueError (json.JSONDecodeError).
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    # "start" — ждём "[", "first" — первый элемент или "]",
+    # "item" — элемент после ",", "sep" — "," или "]" после элемента
+    state = "start"
+
+    while True:
+        while pos < len(buf) and buf[pos].isspace():
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                raise ValueError("Неожиданный конец JSON-массива")
+            chunk = file.read(read_size)
+            eof = chunk == ""
+            buf, pos = chunk, 0
+            continue
+
+        ch = buf[pos]
+        if state == "start":
+            if ch != "[":
+                raise ValueError("Ожидался JSON-массив")
+            state = "first"
+            pos += 1
+            continue
+        if state == "sep":
+            if ch == "]":
+                return
+            if ch != ",":
+                raise ValueError(f"Ожидалась ',' или ']' между элементами JSON-массива, получено {ch!r}")
+            state = "item"
+            pos += 1
+            continue
+        if state == "first" and ch == "]":
+            return
+
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            obj, end = None, len(buf)
+        # элемент мог оборваться на границе куска (в т.ч. число: "12" из "123") — дочитываем
+        if end == len(buf) and not eof:
+            chunk = file.read(read_size)
+            eof = chunk == ""
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield obj
+        state = "sep"
+        pos = end
+
+
+def _validate_chunk(chunk: list) -> list:
+    """
+    Выполняется в процессе-обработчике: полная проверка каждой строки конструктором Supplier.
+    Возвращает [(номер строки, словарь или None, текст ошибки или None)].
+    """
+    result = []
+    for row_no, raw in chunk:
+        try:
+            result.append((row_no, Supplier(raw).to_dict(), None))
+        except (ValueError, TypeError, KeyError) as e:
+            result.append((row_no, None, str(e)))
+    return result
+
+
+class SupplierImportPipeline:
+    """
+    Потоковый импорт больших фидов поставщиков.
+
+    1. Фид (JSON-массив или строки "a;b;...;h" / JSON-объект на строку — формат
+       Supplier._parse_init_input) читается кусками по chunk_size строк.
+    2. Куски проверяются в пуле процессов (workers), в памяти одновременно не больше
+       2 * workers кусков.
+    3. Дубликаты внутри фида по нормализованным name/phone/email/inn отбрасываются
+       (остаётся первая строка).
+    4. Отклонённые строки с текстом ошибки считаются в self.rejected_count; при report_path
+       все они пишутся туда построчно в JSON, on_reject вызывается для каждой, а в памяти
+       (self.rejected) остаются только первые max_rejected.
+    5. Чистые строки передаются в add_suppliers(..., trusted=True) репозитория — без повторной
+       проверки полей (или по одной в add_supplier, если массового метода нет).
+    """
+
+    def __init__(self, repo, chunk_size: int = 10000, workers: int | None = None, report_path: str | None = None,
+                 max_rejected: int = 1000, on_reject=None):
+        self.repo = repo
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.report_path = report_path
+        self.max_rejected = max_rejected
+        self.on_reject = on_reject
+
+        self.total = 0
+        self.inserted = 0
+        self.rejected = []
+        self.rejected_count = 0
+        self._seen = {field: {} for field in Supplier_rep_base._UNIQUE_FIELDS}
+        self._report_file = None
+
+    # --- 1. Чтение ---
+    def iter_chunks(self, file_path: str):
+        with open(file_path, "r", encoding="utf-8") as file:
+            first = file.read(1)
+            while first and first.isspace():
+                first = file.read(1)
+            file.seek(0)
+
+            if first == "[":
+                rows = iter_json_array(file)
+            else:
+                rows = (line.rstrip("\r\n") for line in file)
+
+            chunk = []
+            for row_no, raw in enumerate(rows):
+                if isinstance(raw, str) and not raw.strip():
+                    continue
+                chunk.append((row_no, raw))
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+    # --- 2. Проверка в пуле процессов ---
+    def iter_validated(self, chunks):
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(_validate_chunk, chunk)))
+                if len(pending) >= 2 * self.workers:
+                    yield self._take(pending)
+            while pending:
+                yield self._take(pending)
+
+    @staticmethod
+    def _take(pending):
+        chunk, future = pending.popleft()
+        raw_by_row = dict(chunk)
+        return [(row_no, data, error, raw_by_row[row_no]) for row_no, data, error in future.result()]
+
+    # --- 3. Дедупликация внутри фида ---
+    def _duplicate_of(self, row_no: int, data: dict):
+        keys = {
+            "name": Supplier_rep_base._norm_text(data["name"]),
+            "inn": Supplier_rep_base._norm_inn(data["inn"]),
+            "email": Supplier_rep_base._norm_text(data["email"]),
+            "phone": Supplier_rep_base._norm_phone(data["phone"]),
+        }
+        fields = []
+        first_row = None
+        for field, key in keys.items():
+            if key is None:
+                continue
+            other = self._seen[field].get(key)
+            if other is not None:
+                fields.append(field)
+                first_row = other if first_row is None else min(first_row, other)
+        if fields:
+            return first_row, fields
+
+        for field, key in keys.items():
+            if key is not None:
+                self._seen[field][key] = row_no
+        return None
+
+    # --- 4. Отчёт об отклонённых строках ---
+    def _reject(self, row_no: int, error: str, raw) -> None:
+        entry = {"row": row_no, "error": error, "data": raw}
+        self.rejected_count += 1
+        if len(self.rejected) < self.max_rejected:
+            self.rejected.append(entry)
+        if self.on_reject is not None:
+            self.on_reject(entry)
+        if self._report_file is not None:
+            self._report_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    # --- 5. Передача в репозиторий ---
+    def _insert(self, batch: list) -> None:
+        """
+        batch — [(номер строки фида, Supplier, исходные данные)]
+        """
+        if not batch:
+            return
+
+        suppliers = [s for _, s, _ in batch]
+        add_many = getattr(self.repo, "add_suppliers", None)
+        if add_many is not None:
+            ids, conflicts = add_many(suppliers, trusted=True)
+            for c in conflicts:
+                row_no, _, raw = batch[c["row"]]
+                self._reject(row_no, f"Нарушение уникальности: поля {c['fields']} уже существуют "
+                                     f"(конфликт с supplier_id={c['supplier_id']}).", raw)
+            self.inserted += sum(1 for new_id in ids if new_id is not None)
+            return
+
+        for row_no, supplier, raw in batch:
+            try:
+                self.repo.add_supplier(supplier)
+                self.inserted += 1
+            except ValueError as e:
+                self._reject(row_no, str(e), raw)
+
+    def run(self, file_path: str) -> dict:
+        """
+        Импортирует фид и возвращает сводку {"total", "inserted", "rejected"}
+        """
+        if self.report_path is not None:
+            self._report_file = open(self.report_path, "w", encoding="utf-8")
+        try:
+            for validated in self.iter_validated(self.iter_chunks(file_path)):
+                batch = []
+                for row_no, data, error, raw in validated:
+                    self.total += 1
+                    if error is not None:
+                        self._reject(row_no, error, raw)
+                        continue
+
+                    duplicate = self._duplicate_of(row_no, data)
+                    if duplicate is not None:
+                        first_row, fields = duplicate
+                        self._reject(row_no, f"Дубликат строки {first_row} по полям {fields}", raw)
+                        continue
+
+                    batch.append((row_no, Supplier.from_trusted(data), raw))
+                self._insert(batch)
+        finally:
+            if self._report_file is not None:
+                self._report_file.close()
+                self._report_file = None
+
+        return {"total": self.total, "inserted": self.inserted, "rejected": self.rejected_count}
@@ -1,7 +1,165 @@
 import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 import psycopg2
+from psycopg2 import errors
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from psycopg2.extras import RealDictCursor
-from Supplier import Supplier, SupplierShort
+from psycopg2.pool import PoolError
+from Supplier import Supplier, SupplierShort, VALIDATION_POLICIES
+from Supplier_rep_base import Supplier_rep_base
+import Supplier_rep_DB_schema as schema
+
+
+class ConnectionPool:
+    """
+    Потокобезопасный пул соединений PostgreSQL.
+
+    - соединения открываются лениво: при первой выдаче сразу min_size, дальше — по требованию,
+      но не больше max_size; конструктор к БД не обращается;
+    - если свободных нет и лимит исчерпан, getconn ждёт до timeout секунд, затем PoolError;
+    - проверка здоровья: закрытые соединения отбрасываются, а простоявшие дольше
+      check_idle_after секунд перед выдачей проверяются запросом SELECT 1;
+    - connection() — контекстный менеджер: транзакция фиксируется при успехе,
+      откатывается при исключении, соединение возвращается в пул.
+
+    Один пул можно передать нескольким репозиториям (параметр pool у Supplier_rep_DB).
+    """
+
+    def __init__(self, min_size=1, max_size=10, timeout=30.0, check_idle_after=30.0, **conn_params):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Размеры пула должны удовлетворять 0 <= min_size <= max_size, max_size >= 1")
+        self.conn_params = conn_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_idle_after = check_idle_after
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._started = False
+        self._cond = threading.Condition()
+
+    def _new_connection(self):
+        return psycopg2.connect(**self.conn_params)
+
+    def _start(self) -> None:
+        """
+        Открывает min_size соединений (вызывается под self._cond при первой выдаче).
+        Если открыть удалось не все, уже открытые закрываются, а ошибка пробрасывается.
+        """
+        opened = []
+        try:
+            for _ in range(self.min_size - self._size):
+                opened.append(self._new_connection())
+        except Exception:
+            for conn in opened:
+                try:
+                    conn.close()
+                except psycopg2.Error:
+                    pass
+            raise
+        now = time.monotonic()
+        self._idle.extend((conn, now) for conn in opened)
+        self._size += len(opened)
+        self._started = True
+
+    def _is_alive(self, conn, last_used) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.check_idle_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn) -> None:
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolError("Пул соединений закрыт")
+                    if not self._started:
+                        self._start()
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        conn = last_used = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolError(f"Нет свободных соединений за {self.timeout} с (max_size={self.max_size})")
+                    self._cond.wait(remaining)
+
+            # соединение открываем/проверяем вне блокировки, чтобы не задерживать другие потоки
+            if conn is None:
+                try:
+                    return self._new_connection()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+            if self._is_alive(conn, last_used):
+                return conn
+            self._discard(conn)
+
+    def putconn(self, conn, broken=False) -> None:
+        if not broken and not conn.closed and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
+
+        if broken or conn.closed or self._closed:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        broken = False
+        try:
+            with conn:
+                yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.putconn(conn, broken=broken)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
 
 
 class Supplier_rep_DB:
@@ -13,19 +171,66 @@ class Supplier_rep_DB:
     name, phone, email, inn.
 
     Поля city/address/contact_name в проверке уникальности НЕ участвуют.
+    Правило обеспечивает сама БД через UNIQUE-индексы по нормализованным выражениям
+    (см. Supplier_rep_DB_schema, метод migrate). Запись — один оператор INSERT ... ON CONFLICT /
+    UPDATE; при нарушении ищется конфликтующая запись и бросается ValueError.
+    Перед первой записью (add/replace) проверяется, что индексы созданы: без migrate() — ValueError;
+    чтение и удаление работают и без них.
+
+    Проверка данных (validation): "strict" | "on_write_only" | "off", см. Supplier.VALIDATION_POLICIES.
+    При "on_write_only"/"off" строки из БД превращаются в объекты без повторной валидации.
+
+    Соединения берутся из ConnectionPool. Если pool не передан, репозиторий создаёт
+    собственный пул (min_size/max_size); общий пул можно передать нескольким репозиториям.
     """
 
-    def __init__(self, dbname, user, password, host="localhost", port=5432):
-        self.conn_params = {
-            "dbname": dbname,
-            "user": user,
-            "password": password,
-            "host": host,
-            "port": port
-        }
+    def __init__(self, dbname=None, user=None, password=None, host="localhost", port=5432,
+                 validation="strict", pool: ConnectionPool | None = None, min_size=1, max_size=10):
+        if validation not in VALIDATION_POLICIES:
+            raise ValueError(f"Неизвестная политика проверки: {validation!r}, ожидалась одна из {VALIDATION_POLICIES}")
+        self.validation = validation
+        if pool is not None:
+            self.pool = pool
+            self.conn_params = pool.conn_params
+        else:
+            self.conn_params = {
+                "dbname": dbname,
+                "user": user,
+                "password": password,
+                "host": host,
+                "port": port
+            }
+            self.pool = ConnectionPool(min_size=min_size, max_size=max_size, **self.conn_params)
+        self._schema_checked = False
+
+    @contextmanager
+    def _connect(self, write: bool = False):
+        """
+        Контекстный менеджер: соединение из пула в рамках одной транзакции.
+        write=True — операция опирается на индексы уникальности: при первой такой
+        операции проверяется, что они созданы (schema.check).
+        """
+        with self.pool.connection() as conn:
+            if write and not self._schema_checked:
+                schema.check(conn)
+                self._schema_checked = True
+            yield conn
 
-    def _connect(self):
-        return psycopg2.connect(**self.conn_params)
+    # Порядок колонок для COPY во временную таблицу
+    _COPY_COLUMNS = ("name", "contact_name", "phone", "email", "city", "address", "inn")
+
+    @staticmethod
+    def _copy_escape(value) -> str:
+        """
+        Экранирование значения для текстового формата COPY
+        """
+        if value is None:
+            return "\\N"
+        return (str(value)
+                .replace("\\", "\\\\")
+                .replace("\t", "\\t")
+                .replace("\n", "\\n")
+                .replace("\r", "\\r"))
 
     # --- Нормализация (как в файловых репозиториях) ---
     @staticmethod
@@ -55,57 +260,48 @@ class Supplier_rep_DB:
         digits = re.sub(r"\D", "", value)
         return digits if digits else None
 
+    def migrate(self) -> None:
+        """
+        Создаёт таблицу и индексы уникальности (см. Supplier_rep_DB_schema)
+        """
+        with self.pool.connection() as conn:
+            schema.migrate(conn)
+        self._schema_checked = True
+
     def _check_uniqueness_or_raise(self, conn, candidate: Supplier, exclude_id: int | None = None) -> None:
         """
-        Проверка уникальности в коде (без UNIQUE в SQL):
-        если найден любой supplier, у которого совпадает name или phone или email или inn — ошибка.
+        Ищет запись, с которой конфликтует candidate, и бросает ValueError.
+
+        Вызывается после того, как запись отклонена индексами уникальности.
+        Условия используют те же выражения, что и индексы, поэтому каждое из них
+        проверяется по индексу (BitmapOr), а не полным просмотром таблицы.
         """
         cand_name = self._norm_text(candidate.name)
         cand_email = self._norm_text(getattr(candidate, "email", None))
         cand_phone = self._norm_phone(getattr(candidate, "phone", None))
         cand_inn = self._norm_inn(getattr(candidate, "inn", None))
 
-        # Формируем WHERE динамически (чтобы не сравнивать NULL/пустые)
-        conds = []
-        params = []
-
-        # name (без регистра)
-        if cand_name is not None:
-            conds.append("lower(trim(name)) = lower(trim(%s))")
-            params.append(candidate.name)
-
-        # inn
-        if cand_inn is not None:
-            conds.append("inn = %s")
-            params.append(candidate.inn)
-
-        # email (без регистра)
-        if cand_email is not None:
-            conds.append("lower(trim(email)) = lower(trim(%s))")
-            params.append(candidate.email)
-
-        # phone: сравнение по цифрам (чтобы +7 900... == 7900...)
-        if cand_phone is not None:
-            conds.append("regexp_replace(coalesce(phone,''), '\\D', '', 'g') = %s")
-            params.append(cand_phone)
-
-        if not conds:
-            # Нечего проверять (в твоей модели это маловероятно)
-            return
-
-        where_or = " OR ".join(f"({c})" for c in conds)
+        expr = schema.NORM_EXPRESSIONS
         query = f"""
             SELECT supplier_id, name, phone, email, inn
             FROM suppliers
-            WHERE ({where_or})
+            WHERE ({expr["name"]} = nullif(lower(trim(%(name)s)), '')
+                OR {expr["inn"]} = nullif(trim(%(inn)s), '')
+                OR {expr["email"]} = nullif(lower(trim(%(email)s)), '')
+                OR {expr["phone"]} = nullif(regexp_replace(%(phone)s, '\\D', '', 'g'), ''))
+              AND supplier_id IS DISTINCT FROM %(exclude_id)s
+            ORDER BY supplier_id;
         """
-
-        if exclude_id is not None:
-            query += " AND supplier_id <> %s"
-            params.append(exclude_id)
+        params = {
+            "name": candidate.name,
+            "inn": candidate.inn,
+            "email": candidate.email,
+            "phone": candidate.phone,
+            "exclude_id": exclude_id
+        }
 
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, tuple(params))
+            cur.execute(query, params)
             rows = cur.fetchall()
 
         # Финальная проверка в Python (точно по нашим правилам)
@@ -132,8 +328,13 @@ class Supplier_rep_DB:
                     f"(конфликт с supplier_id={r['supplier_id']})."
                 )
 
-    @staticmethod
-    def _row_to_supplier(row: dict) -> Supplier:
+    def _validate_for_write(self, supplier) -> None:
+        if self.validation != "off":
+            supplier.validate()
+
+    def _row_to_supplier(self, row: dict) -> Supplier:
+        if self.validation != "strict":
+            return Supplier.from_trusted(row)
         return Supplier(
             supplier_id=row["supplier_id"],
             name=row["name"],
@@ -145,6 +346,12 @@ class Supplier_rep_DB:
             inn=row["inn"]
         )
 
+    def _tuple_to_supplier(self, row: tuple) -> Supplier:
+        # row — кортеж в порядке Supplier.possible_keys
+        if self.validation != "strict":
+            return Supplier.from_row(row)
+        return Supplier(*row)
+
     # a) Получить объект по ID
     def get_by_id(self, supplier_id: int):
         query = """
@@ -175,6 +382,9 @@ class Supplier_rep_DB:
                 cur.execute(query, (k, offset))
                 rows = cur.fetchall()
 
+        if self.validation != "strict":
+            return [SupplierShort.from_row(row) for row in rows]
+
         return [
             SupplierShort(
                 supplier_id=row[0],
@@ -186,17 +396,60 @@ class Supplier_rep_DB:
             for row in rows
         ]
 
+    # b') Постраничный вывод по ключу (keyset): страница + токен следующей страницы
+    def get_k_short_page(self, k: int, token: str | None = None, order_by: str = "supplier_id"):
+        """
+        То же, что Supplier_rep_base.get_k_short_page, но в SQL:
+        WHERE (order_by, supplier_id) > (последний ключ) ORDER BY order_by, supplier_id LIMIT k+1.
+        Без OFFSET стоимость страницы не зависит от её номера
+        (при индексе по (order_by, supplier_id)).
+        """
+        after = Supplier_rep_base._decode_page_token(token, order_by)
+
+        if order_by == "supplier_id":
+            order = "supplier_id"
+            where, params = ("WHERE supplier_id > %s", [after[1]]) if after is not None else ("", [])
+        else:
+            order = f"{order_by}, supplier_id"
+            where, params = (f"WHERE ({order_by}, supplier_id) > (%s, %s)", list(after)) if after is not None else ("", [])
+
+        query = f"""
+            SELECT supplier_id, name, phone, email, inn, {order_by}
+            FROM suppliers
+            {where}
+            ORDER BY {order}
+            LIMIT %s;
+        """
+        # берём на одну строку больше, чтобы знать, есть ли следующая страница
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (*params, k + 1))
+                rows = cur.fetchall()
+
+        has_more = len(rows) > k
+        rows = rows[:k]
+
+        if self.validation != "strict":
+            page = [SupplierShort.from_row(row[:5]) for row in rows]
+        else:
+            page = [SupplierShort(*row[:5]) for row in rows]
+
+        next_token = None
+        if has_more and rows:
+            last = rows[-1]
+            next_token = Supplier_rep_base._encode_page_token(order_by, last[5], last[0])
+        return page, next_token
+
     # c) Добавить объект (ID генерируется БД)
     def add_supplier(self, supplier: Supplier) -> Supplier:
         insert_query = """
             INSERT INTO suppliers (name, contact_name, phone, email, city, address, inn)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT DO NOTHING
             RETURNING supplier_id;
         """
-        with self._connect() as conn:
-            # Проверка уникальности перед INSERT
-            self._check_uniqueness_or_raise(conn, supplier, exclude_id=None)
-
+        self._validate_for_write(supplier)
+        with self._connect(write=True) as conn:
             with conn.cursor() as cur:
                 cur.execute(insert_query, (
                     supplier.name,
@@ -207,7 +460,14 @@ class Supplier_rep_DB:
                     supplier.address,
                     supplier.inn
                 ))
-                new_id = cur.fetchone()[0]
+                row = cur.fetchone()
+
+            if row is None:
+                # строка отклонена одним из индексов уникальности
+                self._check_uniqueness_or_raise(conn, supplier, exclude_id=None)
+                # конфликтующую запись успели изменить параллельно
+                raise ValueError("Нарушение уникальности: поля name/phone/email/inn уже существуют.")
+            new_id = row[0]
 
         supplier.supplier_id = new_id
         return supplier
@@ -225,22 +485,32 @@ class Supplier_rep_DB:
                 inn=%s
             WHERE supplier_id=%s;
         """
-        with self._connect() as conn:
-            # Проверка уникальности перед UPDATE, исключая саму запись
-            self._check_uniqueness_or_raise(conn, new_supplier, exclude_id=supplier_id)
-
-            with conn.cursor() as cur:
-                cur.execute(update_query, (
-                    new_supplier.name,
-                    new_supplier.contact_name,
-                    new_supplier.phone,
-                    new_supplier.email,
-                    new_supplier.city,
-                    new_supplier.address,
-                    new_supplier.inn,
-                    supplier_id
-                ))
-                updated = cur.rowcount
+        self._validate_for_write(new_supplier)
+        with self._connect(write=True) as conn:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(update_query, (
+                        new_supplier.name,
+                        new_supplier.contact_name,
+                        new_supplier.phone,
+                        new_supplier.email,
+                        new_supplier.city,
+                        new_supplier.address,
+                        new_supplier.inn,
+                        supplier_id
+                    ))
+                    updated = cur.rowcount
+            except errors.UniqueViolation as e:
+                conn.rollback()
+                self._check_uniqueness_or_raise(conn, new_supplier, exclude_id=supplier_id)
+                # конфликтующую запись успели изменить параллельно — сообщаем поле нарушенного индекса
+                violated = schema.UNIQUE_INDEXES.get(e.diag.constraint_name)
+                fields = [violated] if violated else ["name", "phone", "email", "inn"]
+                raise ValueError(f"Нарушение уникальности: поля {fields} уже существуют.") from e
+
+            if updated == 0:
+                # записи нет, но о конфликте всё равно сообщаем, как раньше
+                self._check_uniqueness_or_raise(conn, new_supplier, exclude_id=supplier_id)
 
         return updated > 0
 
@@ -260,3 +530,211 @@ class Supplier_rep_DB:
             with conn.cursor() as cur:
                 cur.execute(query)
                 return cur.fetchone()[0]
+
+    # h) Потоковое чтение через серверный курсор
+    def iter_sorted_by(self, field: str = "supplier_id", batch_size: int = 2000):
+        """
+        Генератор объектов Supplier, отсортированных в SQL по field (при равенстве — по supplier_id).
+
+        Используется именованный (серверный) курсор: клиент получает строки пачками
+        по batch_size, поэтому память не зависит от размера таблицы.
+        Соединение из пула занято, пока генератор не исчерпан или не закрыт.
+        """
+        if field not in Supplier.possible_keys:
+            raise ValueError(f"Сортировка возможна только по полям {Supplier.possible_keys}")
+
+        order = "supplier_id" if field == "supplier_id" else f"{field}, supplier_id"
+        query = f"""
+            SELECT supplier_id, name, contact_name, phone, email, city, address, inn
+            FROM suppliers
+            ORDER BY {order};
+        """
+        with self._connect() as conn:
+            with conn.cursor(name="suppliers_stream") as cur:
+                cur.itersize = batch_size
+                cur.execute(query)
+                for row in cur:
+                    yield self._tuple_to_supplier(row)
+
+    def iter_all(self, batch_size: int = 2000):
+        return self.iter_sorted_by("supplier_id", batch_size=batch_size)
+
+    def read_all(self) -> list:
+        return list(self.iter_all())
+
+    def sort_by_city(self):
+        return list(self.iter_sorted_by("city"))
+
+    # g) Массовое добавление: COPY во временную таблицу + проверка уникальности одним запросом
+    def add_suppliers(self, suppliers, trusted: bool = False) -> tuple[list, list]:
+        """
+        Добавляет поставщиков пачкой в одной транзакции.
+
+        Строки потоком загружаются через COPY во временную таблицу, затем одним запросом
+        ищутся конфликты name/phone/email/inn как с существующими записями, так и внутри пачки
+        (строка, совпадающая с более ранней строкой пачки, отклоняется), после чего
+        чистые строки вставляются одним INSERT ... SELECT.
+        trusted=True — строки уже проверены вызывающим кодом, повторная проверка полей пропускается.
+
+        Возвращает (ids, conflicts):
+        ids — список той же длины, что и вход: supplier_id добавленной записи или None;
+        conflicts — список словарей {"row", "fields", "supplier_id", "duplicate_of_row"}
+        по отклонённым строкам (row — номер во входной последовательности, с 0).
+        """
+        items = []
+
+        def copy_lines():
+            for row_no, supplier in enumerate(suppliers):
+                if not trusted:
+                    self._validate_for_write(supplier)
+                items.append(supplier)
+                values = [str(row_no)] + [self._copy_escape(getattr(supplier, c)) for c in self._COPY_COLUMNS]
+                yield "\t".join(values) + "\n"
+
+        with self._connect(write=True) as conn:
+            with conn.cursor() as cur:
+                cur.execute(self._STAGE_CREATE_QUERY)
+                cur.copy_expert(
+                    f"COPY _suppliers_stage (row_no, {', '.join(self._COPY_COLUMNS)}) FROM STDIN",
+                    _LineStream(copy_lines())
+                )
+
+                cur.execute(self._STAGE_CONFLICTS_QUERY)
+                conflicts = [
+                    {
+                        "row": row_no,
+                        "fields": list(fields),
+                        "supplier_id": supplier_id,
+                        "duplicate_of_row": other_row
+                    }
+                    for row_no, supplier_id, other_row, fields in cur.fetchall()
+                ]
+
+                # ID выдаём из последовательности заранее, чтобы связать их с номерами строк
+                cur.execute("""
+                    UPDATE _suppliers_stage
+                    SET supplier_id = nextval(pg_get_serial_sequence('suppliers', 'supplier_id'))
+                    WHERE NOT (row_no = ANY(%s));
+                """, ([c["row"] for c in conflicts],))
+
+                # ON CONFLICT DO NOTHING: строки, которые успел занять параллельный писатель,
+                # пропускаются, а не валят всю пачку
+                cur.execute("""
+                    INSERT INTO suppliers (supplier_id, name, contact_name, phone, email, city, address, inn)
+                    SELECT supplier_id, name, contact_name, phone, email, city, address, inn
+                    FROM _suppliers_stage
+                    WHERE supplier_id IS NOT NULL
+                    ORDER BY row_no
+                    ON CONFLICT DO NOTHING
+                    RETURNING supplier_id;
+                """)
+                inserted = {row[0] for row in cur.fetchall()}
+
+                cur.execute("SELECT row_no, supplier_id FROM _suppliers_stage WHERE supplier_id IS NOT NULL;")
+                assigned = {}
+                for row_no, new_id in cur.fetchall():
+                    if new_id in inserted:
+                        assigned[row_no] = new_id
+                    else:
+                        conflicts.append({
+                            "row": row_no,
+                            "fields": [],
+                            "supplier_id": None,
+                            "duplicate_of_row": None
+                        })
+                conflicts.sort(key=lambda c: c["row"])
+
+        ids = [None] * len(items)
+        for row_no, new_id in assigned.items():
+            ids[row_no] = new_id
+            items[row_no].supplier_id = new_id
+
+        return ids, conflicts
+
+    _STAGE_CREATE_QUERY = """
+        CREATE TEMP TABLE _suppliers_stage (
+            row_no integer PRIMARY KEY,
+            name text,
+            contact_name text,
+            phone text,
+            email text,
+            city text,
+            address text,
+            inn text,
+            supplier_id integer
+        ) ON COMMIT DROP;
+    """
+
+    # Нормализация — ровно выражения индексов (schema.NORM_EXPRESSIONS); пары конфликтов
+    # собираются через UNION равенств (а не OR), чтобы планировщик мог использовать hash join.
+    # Конфликт с существующей записью важнее совпадения внутри пачки.
+    _STAGE_CONFLICTS_QUERY = """
+        WITH st AS (
+            SELECT row_no, {norm}
+            FROM _suppliers_stage
+        ),
+        ex AS (
+            SELECT supplier_id, {norm}
+            FROM suppliers
+        ),
+        ex_pairs AS (
+            {ex_pairs}
+        ),
+        dup_pairs AS (
+            {dup_pairs}
+        ),
+        first_ex AS (
+            SELECT row_no, min(supplier_id) AS supplier_id FROM ex_pairs GROUP BY row_no
+        ),
+        first_dup AS (
+            SELECT row_no, min(other_row) AS other_row FROM dup_pairs GROUP BY row_no
+        )
+        SELECT st.row_no,
+               fe.supplier_id,
+               CASE WHEN fe.row_no IS NULL THEN fd.other_row END,
+               array_remove(ARRAY[{fields}], NULL)
+        FROM st
+        LEFT JOIN first_ex fe ON fe.row_no = st.row_no
+        LEFT JOIN ex ON ex.supplier_id = fe.supplier_id
+        LEFT JOIN first_dup fd ON fd.row_no = st.row_no AND fe.row_no IS NULL
+        LEFT JOIN st b ON b.row_no = fd.other_row
+        WHERE fe.row_no IS NOT NULL OR fd.row_no IS NOT NULL
+        ORDER BY st.row_no;
+    """.format(
+        norm=", ".join(f"{expr} AS n_{field}" for field, expr in schema.NORM_EXPRESSIONS.items()),
+        ex_pairs=" UNION ".join(
+            f"SELECT st.row_no, ex.supplier_id FROM st JOIN ex ON ex.n_{field} = st.n_{field}"
+            for field in schema.NORM_EXPRESSIONS
+        ),
+        dup_pairs=" UNION ".join(
+            f"SELECT st.row_no, b.row_no AS other_row FROM st JOIN st b ON b.n_{field} = st.n_{field} AND b.row_no < st.row_no"
+            for field in schema.NORM_EXPRESSIONS
+        ),
+        fields=", ".join(
+            f"CASE WHEN st.n_{field} = coalesce(ex.n_{field}, b.n_{field}) THEN '{field}' END"
+            for field in schema.NORM_EXPRESSIONS
+        ),
+    )
+
+
+class _LineStream:
+    """
+    Файлоподобная обёртка над генератором строк для cursor.copy_expert
+    (строки отдаются по мере чтения, вся пачка в памяти не собирается).
+    """
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+        if size < 0:
+            chunk, self._buffer = self._buffer, ""
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
@@ -0,0 +1,239 @@
+import asyncio
+import asyncpg
+from Supplier import Supplier, SupplierShort, VALIDATION_POLICIES
+from Supplier_rep_base import Supplier_rep_base
+import Supplier_rep_DB_schema as schema
+
+
+class AsyncSupplier_rep_DB:
+    """
+    Асинхронный репозиторий Supplier для PostgreSQL (asyncpg) — те же операции,
+    что у Supplier_rep_DB, но в виде корутин поверх пула asyncpg.
+
+    Уникальность — как в Supplier_rep_DB: нельзя добавлять/заменять, если совпадает
+    ХОТЯ БЫ ОДНО поле из name, phone, email, inn. Правило обеспечивают UNIQUE-индексы
+    из Supplier_rep_DB_schema; при нарушении ищется конфликтующая запись и бросается
+    такой же ValueError.
+
+    Пул создаётся при первом обращении (min_size/max_size) или передаётся готовым (pool).
+    Перед первой записью (add/replace) проверяется, что индексы уникальности созданы:
+    без migrate() — ValueError; чтение и удаление работают и без них.
+    """
+
+    _norm_text = staticmethod(Supplier_rep_base._norm_text)
+    _norm_inn = staticmethod(Supplier_rep_base._norm_inn)
+    _norm_phone = staticmethod(Supplier_rep_base._norm_phone)
+
+    def __init__(self, dbname=None, user=None, password=None, host="localhost", port=5432,
+                 validation="strict", pool: asyncpg.Pool | None = None, min_size=1, max_size=10):
+        if validation not in VALIDATION_POLICIES:
+            raise ValueError(f"Неизвестная политика проверки: {validation!r}, ожидалась одна из {VALIDATION_POLICIES}")
+        self.validation = validation
+        self.conn_params = {
+            "database": dbname,
+            "user": user,
+            "password": password,
+            "host": host,
+            "port": port
+        }
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool = pool
+        self._pool_lock = asyncio.Lock()
+        self._schema_checked = False
+
+    async def _open_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        min_size=self.min_size, max_size=self.max_size, **self.conn_params
+                    )
+        return self._pool
+
+    async def _get_pool(self, write: bool = False) -> asyncpg.Pool:
+        """
+        Пул; для write=True — с проверкой наличия индексов уникальности
+        (один раз, см. schema.check_indexes)
+        """
+        pool = await self._open_pool()
+        if write and not self._schema_checked:
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(schema.INDEXES_QUERY)
+            schema.check_indexes({row[0] for row in rows})
+            self._schema_checked = True
+        return pool
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def migrate(self) -> None:
+        pool = await self._open_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                for statement in schema.SCHEMA_STATEMENTS:
+                    await conn.execute(statement)
+        self._schema_checked = True
+
+    def _validate_for_write(self, supplier) -> None:
+        if self.validation != "off":
+            supplier.validate()
+
+    def _row_to_supplier(self, row) -> Supplier:
+        if self.validation != "strict":
+            return Supplier.from_row(tuple(row))
+        return Supplier(*row)
+
+    def _row_to_short(self, row) -> SupplierShort:
+        if self.validation != "strict":
+            return SupplierShort.from_row(tuple(row))
+        return SupplierShort(*row)
+
+    async def _check_uniqueness_or_raise(self, conn, candidate: Supplier, exclude_id: int | None = None) -> None:
+        """
+        Ищет запись, с которой конфликтует candidate (по тем же выражениям, что и индексы),
+        и бросает ValueError
+        """
+        expr = schema.NORM_EXPRESSIONS
+        rows = await conn.fetch(
+            f"""
+            SELECT supplier_id, name, phone, email, inn
+            FROM suppliers
+            WHERE ({expr["name"]} = nullif(lower(trim($1)), '')
+                OR {expr["inn"]} = nullif(trim($2), '')
+                OR {expr["email"]} = nullif(lower(trim($3)), '')
+                OR {expr["phone"]} = nullif(regexp_replace($4, '\\D', '', 'g'), ''))
+              AND supplier_id IS DISTINCT FROM $5::integer
+            ORDER BY supplier_id;
+            """,
+            candidate.name, candidate.inn, candidate.email, candidate.phone, exclude_id
+        )
+
+        cand_name = self._norm_text(candidate.name)
+        cand_inn = self._norm_inn(candidate.inn)
+        cand_email = self._norm_text(candidate.email)
+        cand_phone = self._norm_phone(candidate.phone)
+
+        # Финальная проверка в Python (точно по нашим правилам)
+        for r in rows:
+            conflicts = []
+
+            if cand_name is not None and self._norm_text(r["name"]) == cand_name:
+                conflicts.append("name")
+
+            if cand_inn is not None and self._norm_inn(r["inn"]) == cand_inn:
+                conflicts.append("inn")
+
+            r_email = self._norm_text(r["email"])
+            if cand_email is not None and r_email is not None and r_email == cand_email:
+                conflicts.append("email")
+
+            r_phone = self._norm_phone(r["phone"])
+            if cand_phone is not None and r_phone is not None and r_phone == cand_phone:
+                conflicts.append("phone")
+
+            if conflicts:
+                raise ValueError(
+                    f"Нарушение уникальности: поля {conflicts} уже существуют "
+                    f"(конфликт с supplier_id={r['supplier_id']})."
+                )
+
+    # a) Получить объект по ID
+    async def get_by_id(self, supplier_id: int):
+        pool = await self._get_pool()
+        row = await pool.fetchrow(
+            """
+            SELECT supplier_id, name, contact_name, phone, email, city, address, inn
+            FROM suppliers
+            WHERE supplier_id = $1;
+            """,
+            supplier_id
+        )
+        if not row:
+            return None
+        return self._row_to_supplier(row)
+
+    # b) Получить k объектов SupplierShort с n-й страницы
+    async def get_k_n_short_list(self, k: int, n: int):
+        offset = (n - 1) * k
+        pool = await self._get_pool()
+        rows = await pool.fetch(
+            """
+            SELECT supplier_id, name, phone, email, inn
+            FROM suppliers
+            ORDER BY supplier_id
+            LIMIT $1 OFFSET $2;
+            """,
+            k, offset
+        )
+        return [self._row_to_short(row) for row in rows]
+
+    # c) Добавить объект (ID генерируется БД)
+    async def add_supplier(self, supplier: Supplier) -> Supplier:
+        self._validate_for_write(supplier)
+        pool = await self._get_pool(write=True)
+        async with pool.acquire() as conn:
+            new_id = await conn.fetchval(
+                """
+                INSERT INTO suppliers (name, contact_name, phone, email, city, address, inn)
+                VALUES ($1, $2, $3, $4, $5, $6, $7)
+                ON CONFLICT DO NOTHING
+                RETURNING supplier_id;
+                """,
+                supplier.name, supplier.contact_name, supplier.phone, supplier.email,
+                supplier.city, supplier.address, supplier.inn
+            )
+            if new_id is None:
+                # строка отклонена одним из индексов уникальности
+                await self._check_uniqueness_or_raise(conn, supplier)
+                raise ValueError("Нарушение уникальности: поля name/phone/email/inn уже существуют.")
+
+        supplier.supplier_id = new_id
+        return supplier
+
+    # d) Заменить элемент по ID
+    async def replace_by_id(self, supplier_id: int, new_supplier: Supplier) -> bool:
+        self._validate_for_write(new_supplier)
+        pool = await self._get_pool(write=True)
+        async with pool.acquire() as conn:
+            try:
+                status = await conn.execute(
+                    """
+                    UPDATE suppliers
+                    SET name=$1,
+                        contact_name=$2,
+                        phone=$3,
+                        email=$4,
+                        city=$5,
+                        address=$6,
+                        inn=$7
+                    WHERE supplier_id=$8;
+                    """,
+                    new_supplier.name, new_supplier.contact_name, new_supplier.phone, new_supplier.email,
+                    new_supplier.city, new_supplier.address, new_supplier.inn, supplier_id
+                )
+            except asyncpg.UniqueViolationError as e:
+                await self._check_uniqueness_or_raise(conn, new_supplier, exclude_id=supplier_id)
+                violated = schema.UNIQUE_INDEXES.get(e.constraint_name)
+                fields = [violated] if violated else ["name", "phone", "email", "inn"]
+                raise ValueError(f"Нарушение уникальности: поля {fields} уже существуют.") from e
+
+            updated = int(status.split()[-1])
+            if updated == 0:
+                # записи нет, но о конфликте всё равно сообщаем, как в Supplier_rep_DB
+                await self._check_uniqueness_or_raise(conn, new_supplier, exclude_id=supplier_id)
+
+        return updated > 0
+
+    # e) Удалить элемент по ID
+    async def delete_by_id(self, supplier_id: int) -> bool:
+        pool = await self._get_pool()
+        status = await pool.execute("DELETE FROM suppliers WHERE supplier_id=$1;", supplier_id)
+        return int(status.split()[-1]) > 0
+
+    # f) Получить количество элементов
+    async def get_count(self) -> int:
+        pool = await self._get_pool()
+        return await pool.fetchval("SELECT COUNT(*) FROM suppliers;")
@@ -0,0 +1,107 @@
+"""
+Схема таблицы suppliers для Supplier_rep_DB и её миграция.
+
+Уникальность name/inn/email/phone обеспечивается самой БД через UNIQUE-индексы
+по выражениям, которые повторяют правила _norm_* репозиториев:
+name/email — без регистра и пробелов по краям, inn — без пробелов по краям,
+phone — только цифры. Пустые значения превращаются в NULL и в уникальности не участвуют.
+
+Все операторы идемпотентны (IF NOT EXISTS), migrate можно вызывать при каждом запуске.
+Если в таблице уже есть дубликаты, создание индекса упадёт — их можно найти через find_duplicates.
+Репозитории перед первой записью проверяют наличие индексов (check) и без них не пишут:
+при обновлении существующей БД migrate() нужно выполнить один раз до запуска.
+"""
+
+# Нормализующие выражения; запросы репозитория должны использовать РОВНО эти выражения,
+# иначе планировщик не сможет применить индексы
+NORM_EXPRESSIONS = {
+    "name": "nullif(lower(trim(name)), '')",
+    "inn": "nullif(trim(inn), '')",
+    "email": "nullif(lower(trim(email)), '')",
+    "phone": "nullif(regexp_replace(phone, '\\D', '', 'g'), '')",
+}
+
+# Имя уникального индекса -> поле (для перевода нарушенного ограничения обратно в поле)
+UNIQUE_INDEXES = {
+    "ux_suppliers_name_norm": "name",
+    "ux_suppliers_inn_norm": "inn",
+    "ux_suppliers_email_norm": "email",
+    "ux_suppliers_phone_norm": "phone",
+}
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS suppliers (
+        supplier_id serial PRIMARY KEY,
+        name text NOT NULL,
+        contact_name text NOT NULL,
+        phone text NOT NULL,
+        email text NOT NULL,
+        city text NOT NULL,
+        address text NOT NULL,
+        inn text NOT NULL
+    );
+    """,
+    *[
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON suppliers (({NORM_EXPRESSIONS[field]}));"
+        for index_name, field in UNIQUE_INDEXES.items()
+    ],
+    # для keyset-пагинации и сортировки (get_k_short_page, sort_by_city)
+    "CREATE INDEX IF NOT EXISTS ix_suppliers_city ON suppliers (city, supplier_id);",
+    "CREATE INDEX IF NOT EXISTS ix_suppliers_name ON suppliers (name, supplier_id);",
+]
+
+# Имена индексов таблицы suppliers в текущей схеме (для проверки при старте)
+INDEXES_QUERY = """
+    SELECT indexname FROM pg_indexes
+    WHERE schemaname = current_schema() AND tablename = 'suppliers';
+"""
+
+
+def check_indexes(present) -> None:
+    """
+    ValueError, если среди имён present нет какого-либо из UNIQUE_INDEXES:
+    без них уникальность не обеспечивается и дубликаты молча попадут в таблицу
+    """
+    missing = [name for name in UNIQUE_INDEXES if name not in present]
+    if missing:
+        raise ValueError(f"У таблицы suppliers нет индексов уникальности {missing}: выполните migrate()")
+
+
+def check(conn) -> None:
+    """
+    Проверяет, что миграция выполнена (см. check_indexes)
+    """
+    with conn.cursor() as cur:
+        cur.execute(INDEXES_QUERY)
+        check_indexes({row[0] for row in cur.fetchall()})
+
+
+def find_duplicates(conn) -> dict:
+    """
+    Поле -> список групп supplier_id с одинаковым нормализованным значением
+    (то, что помешает создать уникальные индексы)
+    """
+    result = {}
+    with conn.cursor() as cur:
+        for field, expr in NORM_EXPRESSIONS.items():
+            cur.execute(f"""
+                SELECT array_agg(supplier_id ORDER BY supplier_id)
+                FROM suppliers
+                WHERE {expr} IS NOT NULL
+                GROUP BY {expr}
+                HAVING count(*) > 1;
+            """)
+            groups = [row[0] for row in cur.fetchall()]
+            if groups:
+                result[field] = groups
+    return result
+
+
+def migrate(conn) -> None:
+    """
+    Создаёт таблицу и индексы (в одной транзакции соединения conn)
+    """
+    with conn.cursor() as cur:
+        for statement in SCHEMA_STATEMENTS:
+            cur.execute(statement)
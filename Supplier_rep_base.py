@@ -1,6 +1,54 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import base64
+import bisect
+import copy
+import json
+from itertools import islice
+import os
 import re
-from Supplier import Supplier, SupplierShort
+import shutil
+import tempfile
+import threading
+from Supplier import Supplier, SupplierShort, VALIDATION_POLICIES
+
+try:
+    import fcntl
+except ImportError:  # Windows: межпроцессных блокировок нет, остаётся атомарная замена файла
+    fcntl = None
+
+# mkstemp создаёт файл с правами 0600; новым файлам даём обычные права с учётом umask
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w"):
+    """
+    Файл для полной перезаписи path: пишется во временный файл рядом, после успешной
+    записи сбрасывается на диск (fsync) и атомарно подменяет path через os.replace.
+    При ошибке временный файл удаляется, а path остаётся прежним.
+    Имя временного файла уникально (mkstemp), поэтому одновременные записи
+    из разных потоков и процессов не портят друг другу временные файлы.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else "utf-8") as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
 
 
 class Supplier_rep_base(ABC):
@@ -12,20 +60,410 @@ class Supplier_rep_base(ABC):
     name, phone, email, inn.
 
     Поля city/address/contact_name в проверке уникальности НЕ участвуют.
+
+    Кэширование:
+    Разобранный список поставщиков хранится в памяти вместе с картой id -> Supplier
+    и индексами нормализованных name/email/phone/inn для проверки уникальности.
+    Кэш сбрасывается только при изменении mtime, размера или inode файла.
+    write_all перестраивает его целиком, add/replace/delete обновляют точечно.
+
+    Режим журнала (journal=True):
+    add/replace/delete не переписывают файл, а дописывают короткую запись
+    в журнал рядом с ним (<file_path>.journal, JSON по строке на изменение).
+    При чтении журнал накатывается поверх основного файла. compact() переносит
+    журнал в основной файл; вызывается вручную или автоматически, когда в журнале
+    накопилось compact_threshold записей. Журнал учитывается при чтении всегда,
+    даже если репозиторий открыт без journal=True.
+
+    Проверка данных (validation): "strict" | "on_write_only" | "off", см. Supplier.VALIDATION_POLICIES.
+
+    Несколько процессов и потоков:
+    чтение файла выполняется под разделяемой блокировкой, а add/replace/delete/write_all/compact
+    (чтение-изменение-запись) — под исключительной (flock на <file_path>.lock).
+    Потоки одного экземпляра дополнительно сериализуются через threading.RLock.
+    Основной файл пишется во временный и подменяется через os.replace, поэтому
+    читатель никогда не видит недописанный файл.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, journal: bool = False, compact_threshold: int = 1000,
+                 validation: str = "strict"):
+        if validation not in VALIDATION_POLICIES:
+            raise ValueError(f"Неизвестная политика проверки: {validation!r}, ожидалась одна из {VALIDATION_POLICIES}")
         self.file_path = file_path
+        self.validation = validation
+        self.journal_path = file_path + ".journal"
+        self.lock_path = file_path + ".lock"
+        self._thread_lock = threading.RLock()
+        self._lock_depth = threading.local()
+        self.journal = journal
+        self.compact_threshold = compact_threshold
+        self._journal_records = 0
+        self._cache_key = None
+        self._cache = None
+        self._cache_seqs = []
+        self._cache_by_id = {}
+        self._cache_index = {}
+        self._cache_max_id = 0
+        self._cache_next_seq = 0
+        self._raw_cache = None
+        self._raw_cache_key = None
+        self._sorted_views = {}
 
     # --- Абстрактные методы (реализация в наследниках) ---
     @abstractmethod
-    def read_all(self) -> list:
+    def _read_data(self) -> list:
+        """
+        Читает файл и возвращает список словарей (сырые записи)
+        """
         pass
 
     @abstractmethod
-    def write_all(self, suppliers: list) -> None:
+    def _write_data(self, data: list) -> None:
+        """
+        Записывает список словарей в файл
+        """
         pass
 
+    # --- Кэш ---
+    @staticmethod
+    def _path_signature(path: str):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _file_signature(self):
+        return self._path_signature(self.file_path), self._path_signature(self.journal_path)
+
+    def _store_cache(self, suppliers: list, key) -> None:
+        by_id = {}
+        for s in suppliers:
+            by_id.setdefault(s.supplier_id, s)
+        self._cache = suppliers
+        self._cache_seqs = list(range(len(suppliers)))
+        self._cache_by_id = by_id
+        self._cache_index = {field: {} for field in self._UNIQUE_FIELDS}
+        for seq, s in enumerate(suppliers):
+            self._index_add(s, seq)
+        self._cache_max_id = self._max_id(suppliers)
+        self._cache_next_seq = len(suppliers)
+        self._sorted_views = {}
+        self._cache_key = key
+
+    @staticmethod
+    def _max_id(suppliers) -> int:
+        return max((s.supplier_id for s in suppliers if isinstance(s.supplier_id, int)), default=0)
+
+    def _load(self) -> list:
+        """
+        Возвращает закэшированный список (НЕ копию), перечитывая файл только если он изменился
+        """
+        if self._cache_is_fresh(self._file_signature()):
+            return self._cache
+
+        with self._file_lock(exclusive=False):
+            key = self._file_signature()
+            if not self._cache_is_fresh(key):
+                # сигнатура снимается ДО чтения: если файл поменяется во время чтения,
+                # следующий вызов увидит новую сигнатуру и перечитает его
+                self._store_cache([self._make_supplier(item) for item in self._read_raw(key)], key)
+                try:
+                    self._replay_journal()
+                except Exception:
+                    self.invalidate_cache()
+                    raise
+                # сырые записи больше не нужны: дальше работаем с объектами
+                self._raw_cache = None
+                self._raw_cache_key = None
+        return self._cache
+
+    # --- Межпроцессные блокировки и атомарная запись ---
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """
+        flock на файле-замке рядом с данными (сам файл данных подменяется при записи,
+        поэтому блокировать его нельзя) под RLock экземпляра. Вложенность считается
+        отдельно в каждом потоке: вложенные вызовы в потоке, уже взявшем блокировку,
+        flock не берут, а другие потоки ждут на RLock.
+        """
+        with self._thread_lock:
+            depth = getattr(self._lock_depth, "value", 0)
+            if fcntl is None or depth:
+                self._lock_depth.value = depth + 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth.value = depth
+                return
+
+            lock_file = open(self.lock_path, "a+")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                self._lock_depth.value = 1
+                yield
+            finally:
+                self._lock_depth.value = 0
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+
+    def _atomic_open(self):
+        """
+        Файл для полной перезаписи file_path (см. atomic_open)
+        """
+        return atomic_open(self.file_path)
+
+    def _iter_raw(self, key):
+        """
+        Сырые записи основного файла по одной. По умолчанию — из _read_raw (файл разбирается
+        целиком); наследник может читать файл потоково, чтобы не разбирать лишнее.
+        """
+        return iter(self._read_raw(key))
+
+    def _cache_is_fresh(self, key) -> bool:
+        return self._cache is not None and key == self._cache_key
+
+    def _read_raw(self, key) -> list:
+        """
+        Сырые записи основного файла (без журнала), закэшированные по той же сигнатуре,
+        что и основной кэш: повторные постраничные чтения не разбирают файл заново
+        """
+        if self._raw_cache is None or key != self._raw_cache_key:
+            self._raw_cache = self._read_data()
+            self._raw_cache_key = key
+        return self._raw_cache
+
+    def invalidate_cache(self) -> None:
+        self._cache = None
+        self._cache_key = None
+
+    # --- Политика проверки ---
+    def _make_supplier(self, item: dict) -> Supplier:
+        if self.validation == "strict":
+            return Supplier(item)
+        return Supplier.from_trusted(item)
+
+    def _make_short(self, item: dict) -> SupplierShort:
+        if self.validation == "strict":
+            return SupplierShort(item)
+        return SupplierShort.from_trusted(item)
+
+    def _validate_for_write(self, supplier) -> None:
+        if self.validation != "off":
+            supplier.validate()
+
+    def _short_of(self, s) -> SupplierShort:
+        if self.validation == "strict":
+            return SupplierShort(
+                supplier_id=s.supplier_id,
+                name=s.name,
+                phone=s.phone,
+                email=s.email,
+                inn=s.inn
+            )
+        return SupplierShort.from_row((s.supplier_id, s.name, s.phone, s.email, s.inn))
+
+    @staticmethod
+    def _clone(supplier):
+        # наружу отдаём копии, чтобы изменения объектов вызывающим кодом не портили кэш
+        return copy.copy(supplier)
+
+    def read_all(self) -> list:
+        return [self._clone(s) for s in self._load()]
+
+    def read_records(self) -> list:
+        """
+        Сырые словари поставщиков (основной файл с накатанным журналом) без построения
+        объектов Supplier и без проверки — для массовой загрузки (SupplierTable.from_file).
+        Словари общие с кэшем файла: изменять их нельзя.
+        """
+        with self._file_lock(exclusive=False):
+            records = list(self._read_raw(self._file_signature()))
+            position = {}
+            for i, item in enumerate(records):
+                position.setdefault(item.get("supplier_id"), i)
+            # supplier_id -> граница: строки с этим id левее неё удалены (как в _apply_delete)
+            deleted = {}
+
+            for record in self._iter_journal():
+                op = record.get("op")
+                if op in ("add", "replace"):
+                    item = record["supplier"]
+                    i = position.get(item["supplier_id"])
+                    if i is None:
+                        position[item["supplier_id"]] = len(records)
+                        records.append(item)
+                    else:
+                        records[i] = item
+                elif op == "delete":
+                    if position.pop(record["supplier_id"], None) is not None:
+                        deleted[record["supplier_id"]] = len(records)
+
+        if not deleted:
+            return records
+        return [
+            item for i, item in enumerate(records)
+            if i >= deleted.get(item.get("supplier_id"), -1)
+        ]
+
+    def write_all(self, suppliers: list) -> None:
+        for s in suppliers:
+            self._validate_for_write(s)
+        with self._file_lock(exclusive=True):
+            suppliers = [self._clone(s) for s in suppliers]
+            self._write_snapshot(suppliers)
+            self._store_cache(suppliers, self._file_signature())
+
+    # --- Точечные изменения кэша ---
+    def _apply_add(self, stored) -> None:
+        self._sorted_views = {}
+        seq = self._cache_next_seq
+        self._cache_next_seq += 1
+        self._cache.append(stored)
+        self._cache_seqs.append(seq)
+        self._cache_by_id.setdefault(stored.supplier_id, stored)
+        self._index_add(stored, seq)
+        if isinstance(stored.supplier_id, int) and stored.supplier_id > self._cache_max_id:
+            self._cache_max_id = stored.supplier_id
+
+    def _apply_replace(self, stored) -> bool:
+        self._sorted_views = {}
+        for i, supplier in enumerate(self._cache):
+            if supplier.supplier_id == stored.supplier_id:
+                self._index_remove(supplier)
+                self._cache[i] = stored
+                self._index_add(stored, self._cache_seqs[i])
+                self._cache_by_id[stored.supplier_id] = stored
+                return True
+        return False
+
+    def _apply_delete(self, supplier_id: int) -> bool:
+        removed = [s for s in self._cache if s.supplier_id == supplier_id]
+        if not removed:
+            return False
+
+        self._sorted_views = {}
+        kept = [(seq, s) for seq, s in zip(self._cache_seqs, self._cache) if s.supplier_id != supplier_id]
+        self._cache = [s for _, s in kept]
+        self._cache_seqs = [seq for seq, _ in kept]
+        for s in removed:
+            self._index_remove(s)
+        self._cache_by_id.pop(supplier_id, None)
+        if supplier_id == self._cache_max_id:
+            self._cache_max_id = self._max_id(self._cache)
+        return True
+
+    # --- Сохранение ---
+    def _write_snapshot(self, suppliers: list) -> None:
+        """
+        Переписывает основной файл целиком; журнал после этого больше не нужен
+        """
+        self._write_data([s.to_dict() for s in suppliers])
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self._journal_records = 0
+
+    def _commit(self, record: dict) -> None:
+        self._commit_many([record])
+
+    def _commit_many(self, records: list) -> None:
+        """
+        Сохраняет изменения, уже применённые к кэшу:
+        в режиме журнала — дописывает записи, иначе переписывает файл целиком (один раз)
+        """
+        if not records:
+            return
+        try:
+            if self.journal:
+                self._append_journal(records)
+                self._journal_records += len(records)
+            else:
+                self._write_snapshot(self._cache)
+        except Exception:
+            self.invalidate_cache()
+            raise
+        self._cache_key = self._file_signature()
+
+        if self.journal and self._journal_records >= self.compact_threshold:
+            self.compact()
+
+    def _append_journal(self, records: list) -> None:
+        """
+        Дописывает записи в журнал и сбрасывает их на диск (fsync).
+        Недописанная строка, оставшаяся от прошлого сбоя, сначала отрезается:
+        иначе новая запись приклеилась бы к ней и потерялась при накате.
+        """
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+        with open(self.journal_path, "ab+") as file:
+            size = file.seek(0, os.SEEK_END)
+            if size:
+                file.seek(size - 1)
+                if file.read(1) != b"\n":
+                    file.seek(0)
+                    file.truncate(file.read().rfind(b"\n") + 1)
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _iter_journal(self):
+        """
+        Записи журнала по порядку. Повреждённой может быть только последняя строка
+        (обрыв записи) — она пропускается; испорченная строка в середине — ValueError.
+        """
+        try:
+            file = open(self.journal_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+
+        with file:
+            lines = file.readlines()
+
+        for line_no, line in enumerate(lines, start=1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                if line_no == len(lines):
+                    return
+                raise ValueError(f"Журнал {self.journal_path} повреждён: строка {line_no} не разбирается") from None
+            yield record
+
+    def _replay_journal(self) -> None:
+        """
+        Накатывает журнал на только что загруженный снимок.
+
+        Накат идемпотентен ("add" для уже существующего id работает как "replace"),
+        поэтому сбой между записью основного файла и удалением журнала в compact()
+        не портит данные. Повреждённой может быть только последняя строка (обрыв записи) —
+        она пропускается; испорченная строка в середине журнала — ValueError.
+        """
+        self._journal_records = 0
+        for record in self._iter_journal():
+            op = record.get("op")
+            if op in ("add", "replace"):
+                stored = self._make_supplier(record["supplier"])
+                if stored.supplier_id in self._cache_by_id:
+                    self._apply_replace(stored)
+                else:
+                    self._apply_add(stored)
+            elif op == "delete":
+                self._apply_delete(record["supplier_id"])
+            self._journal_records += 1
+
+    def compact(self) -> None:
+        """
+        Переносит накопленный журнал в основной файл и удаляет журнал
+        """
+        with self._file_lock(exclusive=True):
+            self._load()
+            try:
+                self._write_snapshot(self._cache)
+            except Exception:
+                self.invalidate_cache()
+                raise
+            self._cache_key = self._file_signature()
+
     # --- Нормализация для корректного сравнения ---
     @staticmethod
     def _norm_text(value):
@@ -54,117 +492,273 @@ class Supplier_rep_base(ABC):
         digits = re.sub(r"\D", "", value)
         return digits if digits else None
 
-    def _check_uniqueness_or_raise(self, suppliers: list, candidate: Supplier, exclude_id: int | None = None) -> None:
-        """
-        Проверяет уникальность по правилу:
-        если совпадает хотя бы одно поле name/phone/email/inn с любой другой записью — ошибка.
+    # --- Индексы уникальности ---
+    # Поля в том порядке, в котором они перечисляются в сообщении об ошибке
+    _UNIQUE_FIELDS = ("name", "inn", "email", "phone")
 
-        exclude_id используется для replace: не сравниваем запись сама с собой.
+    def _norm_keys(self, supplier) -> dict:
+        return {
+            "name": self._norm_text(getattr(supplier, "name", None)),
+            "inn": self._norm_inn(getattr(supplier, "inn", None)),
+            "email": self._norm_text(getattr(supplier, "email", None)),
+            "phone": self._norm_phone(getattr(supplier, "phone", None)),
+        }
+
+    def _index_add(self, supplier, seq: int) -> None:
+        """
+        Корзины индекса хранят пары (seq, supplier), упорядоченные по seq —
+        порядковому номеру записи в списке.
         """
-        cand_name = self._norm_text(getattr(candidate, "name", None))
-        cand_email = self._norm_text(getattr(candidate, "email", None))
-        cand_phone = self._norm_phone(getattr(candidate, "phone", None))
-        cand_inn = self._norm_inn(getattr(candidate, "inn", None))
+        for field, key in self._norm_keys(supplier).items():
+            if key is not None:
+                bisect.insort(self._cache_index[field].setdefault(key, []), (seq, supplier))
 
-        for s in suppliers:
-            if exclude_id is not None and s.supplier_id == exclude_id:
+    def _index_remove(self, supplier) -> None:
+        for field, key in self._norm_keys(supplier).items():
+            if key is None:
                 continue
+            index = self._cache_index[field]
+            bucket = [item for item in index.get(key, ()) if item[1] is not supplier]
+            if bucket:
+                index[key] = bucket
+            else:
+                index.pop(key, None)
+
+    def _find_conflict(self, candidate: Supplier, exclude_id: int | None = None):
+        """
+        Ищет первую по порядку запись, у которой совпадает хотя бы одно поле name/phone/email/inn.
+        Возвращает (supplier, список совпавших полей) или None.
+
+        Проверка идёт по индексам закэшированного списка (O(1) на поле); результат
+        тот же, что и при линейном просмотре.
+        """
+        self._load()
+        cand_keys = self._norm_keys(candidate)
 
-            conflicts = []
+        # первая подходящая запись из корзины каждого поля
+        hits = []
+        for field, key in cand_keys.items():
+            if key is None:
+                continue
+            for seq, s in self._cache_index[field].get(key, ()):
+                if exclude_id is not None and s.supplier_id == exclude_id:
+                    continue
+                hits.append((seq, s))
+                break
 
-            # name
-            if cand_name is not None and self._norm_text(getattr(s, "name", None)) == cand_name:
-                conflicts.append("name")
+        if not hits:
+            return None
 
-            # inn
-            if cand_inn is not None and self._norm_inn(getattr(s, "inn", None)) == cand_inn:
-                conflicts.append("inn")
+        _, s = min(hits, key=lambda item: item[0])
+        s_keys = self._norm_keys(s)
+        conflicts = [
+            field for field in self._UNIQUE_FIELDS
+            if cand_keys[field] is not None and s_keys[field] == cand_keys[field]
+        ]
+        return s, conflicts
 
-            # email (проверяем только если email задан у кандидата и у существующей записи)
-            s_email = self._norm_text(getattr(s, "email", None))
-            if cand_email is not None and s_email is not None and s_email == cand_email:
-                conflicts.append("email")
+    def _check_uniqueness_or_raise(self, candidate: Supplier, exclude_id: int | None = None) -> None:
+        """
+        Проверяет уникальность по правилу:
+        если совпадает хотя бы одно поле name/phone/email/inn с любой другой записью — ошибка.
 
-            # phone (проверяем только если phone задан у кандидата и у существующей записи)
-            s_phone = self._norm_phone(getattr(s, "phone", None))
-            if cand_phone is not None and s_phone is not None and s_phone == cand_phone:
-                conflicts.append("phone")
+        exclude_id используется для replace: не сравниваем запись сама с собой.
+        """
+        found = self._find_conflict(candidate, exclude_id)
+        if found is None:
+            return
 
-            if conflicts:
-                raise ValueError(
-                    f"Нарушение уникальности: поля {conflicts} уже существуют "
-                    f"(конфликт с supplier_id={s.supplier_id})."
-                )
+        s, conflicts = found
+        raise ValueError(
+            f"Нарушение уникальности: поля {conflicts} уже существуют "
+            f"(конфликт с supplier_id={s.supplier_id})."
+        )
 
     # --- Общая логика ---
     def get_by_id(self, supplier_id: int):
-        for supplier in self.read_all():
-            if supplier.supplier_id == supplier_id:
-                return supplier
-        return None
+        self._load()
+        supplier = self._cache_by_id.get(supplier_id)
+        return self._clone(supplier) if supplier is not None else None
 
     def get_k_n_short_list(self, k: int, n: int):
-        suppliers = self.read_all()
-
-        short_list = [
-            SupplierShort(
-                supplier_id=s.supplier_id,
-                name=s.name,
-                phone=s.phone,
-                email=s.email,
-                inn=s.inn
-            )
-            for s in suppliers
-        ]
+        """
+        Создаёт объекты только для запрошенной страницы.
 
+        Если кэш объектов актуален — берётся срез из него. Иначе (и если нет журнала,
+        который надо накатывать) записи читаются по одной (_iter_raw) до конца страницы,
+        и для каждой строки страницы проверяются только поля SupplierShort.
+        """
         start = (n - 1) * k
         end = start + k
-        return short_list[start:end]
+
+        key = self._file_signature()
+        if self._cache_is_fresh(key) or key[1] is not None:
+            return [self._short_of(s) for s in self._load()[start:end]]
+
+        if self._raw_cache is not None and key == self._raw_cache_key:
+            return [self._make_short(item) for item in self._raw_cache[start:end]]
+
+        with self._file_lock(exclusive=False):
+            rows = self._iter_raw(key)
+            try:
+                page = list(islice(rows, start, end))
+            finally:
+                close = getattr(rows, "close", None)
+                if close is not None:
+                    close()
+        return [self._make_short(item) for item in page]
+
+    # --- Постраничный вывод по ключу (keyset) ---
+    # Допустимые поля сортировки; при равенстве значений порядок задаёт supplier_id
+    PAGE_ORDERS = ("supplier_id", "city", "name")
+
+    @staticmethod
+    def _encode_page_token(order_by: str, value, supplier_id) -> str:
+        raw = json.dumps([order_by, value, supplier_id], ensure_ascii=False).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @classmethod
+    def _decode_page_token(cls, token: str | None, order_by: str):
+        """
+        Возвращает (value, supplier_id) последней выданной записи или None для первой страницы
+        """
+        if order_by not in cls.PAGE_ORDERS:
+            raise ValueError(f"Сортировка возможна только по полям {cls.PAGE_ORDERS}")
+        if token is None:
+            return None
+        try:
+            token_order, value, supplier_id = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        except (ValueError, TypeError):
+            raise ValueError("Некорректный токен страницы")
+        if token_order != order_by:
+            raise ValueError("Токен страницы получен для другой сортировки")
+        return value, supplier_id
+
+    def _sorted_view(self, order_by: str):
+        """
+        Отсортированные ключи (value, supplier_id) и записи; строится один раз и
+        сбрасывается при любом изменении кэша
+        """
+        view = self._sorted_views.get(order_by)
+        if view is None:
+            rows = sorted(self._load(), key=lambda s: (getattr(s, order_by), s.supplier_id))
+            keys = [(getattr(s, order_by), s.supplier_id) for s in rows]
+            view = self._sorted_views[order_by] = (keys, rows)
+        return view
+
+    def get_k_short_page(self, k: int, token: str | None = None, order_by: str = "supplier_id"):
+        """
+        Страница из k объектов SupplierShort после записи, на которой закончилась
+        предыдущая страница (token), и токен следующей страницы (None — страниц больше нет).
+        Стоимость не зависит от номера страницы: бинарный поиск + k объектов.
+        """
+        after = self._decode_page_token(token, order_by)
+        self._load()
+        keys, rows = self._sorted_view(order_by)
+
+        start = bisect.bisect_right(keys, tuple(after)) if after is not None else 0
+        end = start + k
+        page = [self._short_of(s) for s in rows[start:end]]
+
+        next_token = None
+        if end < len(rows) and page:
+            next_token = self._encode_page_token(order_by, *keys[end - 1])
+        return page, next_token
 
     def sort_by_city(self):
         return sorted(self.read_all(), key=lambda s: s.city)
 
     def add_supplier(self, supplier: Supplier):
-        suppliers = self.read_all()
+        self._validate_for_write(supplier)
+        with self._file_lock(exclusive=True):
+            self._load()
 
-        # Уникальность ДО генерации ID и добавления
-        self._check_uniqueness_or_raise(suppliers, supplier, exclude_id=None)
+            # Уникальность ДО генерации ID и добавления
+            self._check_uniqueness_or_raise(supplier, exclude_id=None)
 
-        existing_ids = [
-            s.supplier_id for s in suppliers
-            if isinstance(s.supplier_id, int)
-        ]
-        new_id = max(existing_ids) + 1 if existing_ids else 1
-        supplier.supplier_id = new_id
+            new_id = self._cache_max_id + 1
+            supplier.supplier_id = new_id
 
-        suppliers.append(supplier)
-        self.write_all(suppliers)
-        return supplier
+            stored = self._clone(supplier)
+            self._apply_add(stored)
+            self._commit({"op": "add", "supplier": stored.to_dict()})
+            return supplier
+
+    def add_suppliers(self, suppliers, trusted: bool = False) -> tuple[list, list]:
+        """
+        Массовое добавление: все строки проверяются и добавляются под одной блокировкой,
+        файл записывается один раз (в режиме журнала — одна дозапись).
+        trusted=True — строки уже проверены вызывающим кодом (SupplierImportPipeline),
+        повторная проверка полей пропускается; уникальность проверяется всегда.
+
+        Возвращает (ids, conflicts) в том же виде, что и Supplier_rep_DB.add_suppliers:
+        ids — supplier_id добавленной записи или None для каждой входной строки;
+        conflicts — словари {"row", "fields", "supplier_id", "duplicate_of_row"}.
+        Строки проверяются по очереди, поэтому конфликт с более ранней строкой пачки
+        сообщается через её уже выданный supplier_id.
+        """
+        ids = []
+        conflicts = []
+        records = []
+        with self._file_lock(exclusive=True):
+            self._load()
+            try:
+                for row_no, supplier in enumerate(suppliers):
+                    if not trusted:
+                        self._validate_for_write(supplier)
+
+                    found = self._find_conflict(supplier)
+                    if found is not None:
+                        s, fields = found
+                        ids.append(None)
+                        conflicts.append({
+                            "row": row_no,
+                            "fields": fields,
+                            "supplier_id": s.supplier_id,
+                            "duplicate_of_row": None
+                        })
+                        continue
+
+                    new_id = self._cache_max_id + 1
+                    supplier.supplier_id = new_id
+                    stored = self._clone(supplier)
+                    self._apply_add(stored)
+                    records.append({"op": "add", "supplier": stored.to_dict()})
+                    ids.append(new_id)
+            except Exception:
+                # часть строк уже в кэше, но не в файле
+                self.invalidate_cache()
+                raise
+
+            self._commit_many(records)
+        return ids, conflicts
 
     def replace_by_id(self, supplier_id: int, new_supplier: Supplier) -> bool:
-        suppliers = self.read_all()
+        self._validate_for_write(new_supplier)
+        with self._file_lock(exclusive=True):
+            self._load()
 
-        # Проверяем уникальность, исключая текущий supplier_id
-        self._check_uniqueness_or_raise(suppliers, new_supplier, exclude_id=supplier_id)
+            # Проверяем уникальность, исключая текущий supplier_id
+            self._check_uniqueness_or_raise(new_supplier, exclude_id=supplier_id)
 
-        for i, supplier in enumerate(suppliers):
-            if supplier.supplier_id == supplier_id:
-                new_supplier.supplier_id = supplier_id
-                suppliers[i] = new_supplier
-                self.write_all(suppliers)
-                return True
+            if supplier_id not in self._cache_by_id:
+                return False
 
-        return False
+            new_supplier.supplier_id = supplier_id
+            stored = self._clone(new_supplier)
+            self._apply_replace(stored)
+            self._commit({"op": "replace", "supplier": stored.to_dict()})
+            return True
 
     def delete_by_id(self, supplier_id: int) -> bool:
-        suppliers = self.read_all()
-        filtered = [s for s in suppliers if s.supplier_id != supplier_id]
+        with self._file_lock(exclusive=True):
+            self._load()
 
-        if len(filtered) == len(suppliers):
-            return False
+            if not self._apply_delete(supplier_id):
+                return False
 
-        self.write_all(filtered)
-        return True
+            self._commit({"op": "delete", "supplier_id": supplier_id})
+            return True
 
     def get_count(self) -> int:
-        return len(self.read_all())
+        return len(self._load())
@@ -1,24 +1,50 @@
 import json
-from Supplier import Supplier
+import os
+from Supplier_import import iter_json_array
 from Supplier_rep_base import Supplier_rep_base
 
 
 class Supplier_rep_json(Supplier_rep_base):
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, journal: bool = False, compact_threshold: int = 1000,
+                 validation: str = "strict"):
         if not file_path.endswith(".json"):
             raise ValueError("Файл должен быть формата .json")
-        super().__init__(file_path)
+        super().__init__(file_path, journal=journal, compact_threshold=compact_threshold,
+                         validation=validation)
 
-    def read_all(self) -> list:
+    def _read_data(self) -> list:
         try:
             with open(self.file_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = []
+                text = file.read()
+        except FileNotFoundError:
+            return []
 
-        return [Supplier(item) for item in data]
+        # пустой файл — пустой список (как у YAML); запись атомарная, поэтому
+        # ошибка разбора означает повреждение, и молча терять данные нельзя
+        if not text.strip():
+            return []
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Файл {self.file_path} повреждён: {e}") from e
+
+    def _iter_raw(self, key):
+        """
+        Потоковое чтение JSON-массива (iter_json_array): разбирается только то,
+        что запрошено, остаток файла не читается
+        """
+        try:
+            file = open(self.file_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            try:
+                yield from iter_json_array(file, read_size=1 << 16)
+            except ValueError as e:
+                raise ValueError(f"Файл {self.file_path} повреждён: {e}") from e
 
-    def write_all(self, suppliers: list) -> None:
-        data = [supplier.to_dict() for supplier in suppliers]
-        with open(self.file_path, "w", encoding="utf-8") as file:
+    def _write_data(self, data: list) -> None:
+        with self._atomic_open() as file:
             json.dump(data, file, ensure_ascii=False, indent=4)
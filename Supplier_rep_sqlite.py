@@ -0,0 +1,238 @@
+import sqlite3
+from Supplier import Supplier, SupplierShort, VALIDATION_POLICIES
+from Supplier_rep_base import Supplier_rep_base
+
+
+class Supplier_rep_sqlite:
+    """
+    Репозиторий Supplier во встроенной SQLite (один файл, без сервера).
+
+    Уникальность (как в остальных репозиториях):
+    Нельзя добавлять/заменять, если совпадает ХОТЯ БЫ ОДНО поле из:
+    name, phone, email, inn.
+
+    Нормализованные значения (по тем же правилам _norm_*) хранятся в отдельных колонках
+    *_key с UNIQUE-индексами, поэтому проверка — это одна проверка индекса в самой БД.
+    Пустые email/phone хранятся как NULL и в уникальности не участвуют.
+
+    Файл открывается в режиме WAL: читатели не блокируют писателя.
+    """
+
+    _norm_text = staticmethod(Supplier_rep_base._norm_text)
+    _norm_inn = staticmethod(Supplier_rep_base._norm_inn)
+    _norm_phone = staticmethod(Supplier_rep_base._norm_phone)
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS suppliers (
+            supplier_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            contact_name TEXT NOT NULL,
+            phone TEXT NOT NULL,
+            email TEXT NOT NULL,
+            city TEXT NOT NULL,
+            address TEXT NOT NULL,
+            inn TEXT NOT NULL,
+            name_key TEXT,
+            inn_key TEXT,
+            email_key TEXT,
+            phone_key TEXT
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_suppliers_name_key ON suppliers (name_key);
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_suppliers_inn_key ON suppliers (inn_key);
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_suppliers_email_key ON suppliers (email_key);
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_suppliers_phone_key ON suppliers (phone_key);
+        CREATE INDEX IF NOT EXISTS ix_suppliers_city ON suppliers (city, supplier_id);
+        CREATE INDEX IF NOT EXISTS ix_suppliers_name ON suppliers (name, supplier_id);
+    """
+
+    _SUPPLIER_COLUMNS = "supplier_id, name, contact_name, phone, email, city, address, inn"
+
+    def __init__(self, db_path: str, validation: str = "strict"):
+        if validation not in VALIDATION_POLICIES:
+            raise ValueError(f"Неизвестная политика проверки: {validation!r}, ожидалась одна из {VALIDATION_POLICIES}")
+        self.db_path = db_path
+        self.validation = validation
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.executescript(self._SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _keys(self, supplier) -> tuple:
+        # порядок совпадает с колонками name_key, inn_key, email_key, phone_key
+        return (
+            self._norm_text(supplier.name),
+            self._norm_inn(supplier.inn),
+            self._norm_text(supplier.email),
+            self._norm_phone(supplier.phone),
+        )
+
+    def _validate_for_write(self, supplier) -> None:
+        if self.validation != "off":
+            supplier.validate()
+
+    def _raise_conflict(self, candidate: Supplier, exclude_id: int | None = None) -> None:
+        """
+        Ищет запись, с которой конфликтует кандидат, и бросает ValueError
+        с тем же текстом, что и остальные репозитории. Каждое условие OR
+        проверяется по своему UNIQUE-индексу.
+        """
+        keys = self._keys(candidate)
+        row = self._conn.execute(
+            """
+            SELECT supplier_id, name_key, inn_key, email_key, phone_key
+            FROM suppliers
+            WHERE (name_key = ? OR inn_key = ? OR email_key = ? OR phone_key = ?)
+              AND supplier_id IS NOT ?
+            ORDER BY supplier_id
+            LIMIT 1;
+            """,
+            (*keys, exclude_id)
+        ).fetchone()
+        if row is None:
+            return
+
+        conflicts = [
+            field for field, cand_key, row_key in zip(("name", "inn", "email", "phone"), keys, row[1:])
+            if cand_key is not None and cand_key == row_key
+        ]
+        raise ValueError(
+            f"Нарушение уникальности: поля {conflicts} уже существуют "
+            f"(конфликт с supplier_id={row[0]})."
+        )
+
+    def _row_to_supplier(self, row) -> Supplier:
+        if self.validation != "strict":
+            return Supplier.from_row(row)
+        return Supplier(*row)
+
+    # a) Получить объект по ID
+    def get_by_id(self, supplier_id: int):
+        row = self._conn.execute(
+            f"SELECT {self._SUPPLIER_COLUMNS} FROM suppliers WHERE supplier_id = ?;",
+            (supplier_id,)
+        ).fetchone()
+        if not row:
+            return None
+        return self._row_to_supplier(row)
+
+    # b) Получить k объектов SupplierShort с n-й страницы
+    def get_k_n_short_list(self, k: int, n: int):
+        offset = (n - 1) * k
+        rows = self._conn.execute(
+            """
+            SELECT supplier_id, name, phone, email, inn
+            FROM suppliers
+            ORDER BY supplier_id
+            LIMIT ? OFFSET ?;
+            """,
+            (k, offset)
+        ).fetchall()
+
+        if self.validation != "strict":
+            return [SupplierShort.from_row(row) for row in rows]
+        return [SupplierShort(*row) for row in rows]
+
+    # b') Постраничный вывод по ключу (keyset): страница + токен следующей страницы
+    def get_k_short_page(self, k: int, token: str | None = None, order_by: str = "supplier_id"):
+        after = Supplier_rep_base._decode_page_token(token, order_by)
+
+        if order_by == "supplier_id":
+            order = "supplier_id"
+            where, params = ("WHERE supplier_id > ?", [after[1]]) if after is not None else ("", [])
+        else:
+            order = f"{order_by}, supplier_id"
+            where, params = (f"WHERE ({order_by}, supplier_id) > (?, ?)", list(after)) if after is not None else ("", [])
+
+        rows = self._conn.execute(
+            f"""
+            SELECT supplier_id, name, phone, email, inn, {order_by}
+            FROM suppliers
+            {where}
+            ORDER BY {order}
+            LIMIT ?;
+            """,
+            (*params, k + 1)
+        ).fetchall()
+
+        has_more = len(rows) > k
+        rows = rows[:k]
+
+        if self.validation != "strict":
+            page = [SupplierShort.from_row(row[:5]) for row in rows]
+        else:
+            page = [SupplierShort(*row[:5]) for row in rows]
+
+        next_token = None
+        if has_more and rows:
+            last = rows[-1]
+            next_token = Supplier_rep_base._encode_page_token(order_by, last[5], last[0])
+        return page, next_token
+
+    # c) Сортировка по городу (по индексу city, supplier_id)
+    def sort_by_city(self):
+        rows = self._conn.execute(
+            f"SELECT {self._SUPPLIER_COLUMNS} FROM suppliers ORDER BY city, supplier_id;"
+        ).fetchall()
+        return [self._row_to_supplier(row) for row in rows]
+
+    # d) Добавить объект (ID генерируется БД)
+    def add_supplier(self, supplier: Supplier) -> Supplier:
+        self._validate_for_write(supplier)
+        try:
+            with self._conn:
+                cur = self._conn.execute(
+                    """
+                    INSERT INTO suppliers (name, contact_name, phone, email, city, address, inn,
+                                           name_key, inn_key, email_key, phone_key)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                    """,
+                    (supplier.name, supplier.contact_name, supplier.phone, supplier.email,
+                     supplier.city, supplier.address, supplier.inn, *self._keys(supplier))
+                )
+        except sqlite3.IntegrityError:
+            self._raise_conflict(supplier)
+            raise
+
+        supplier.supplier_id = cur.lastrowid
+        return supplier
+
+    # e) Заменить элемент по ID
+    def replace_by_id(self, supplier_id: int, new_supplier: Supplier) -> bool:
+        self._validate_for_write(new_supplier)
+        try:
+            with self._conn:
+                cur = self._conn.execute(
+                    """
+                    UPDATE suppliers
+                    SET name=?, contact_name=?, phone=?, email=?, city=?, address=?, inn=?,
+                        name_key=?, inn_key=?, email_key=?, phone_key=?
+                    WHERE supplier_id=?;
+                    """,
+                    (new_supplier.name, new_supplier.contact_name, new_supplier.phone,
+                     new_supplier.email, new_supplier.city, new_supplier.address, new_supplier.inn,
+                     *self._keys(new_supplier), supplier_id)
+                )
+        except sqlite3.IntegrityError:
+            self._raise_conflict(new_supplier, exclude_id=supplier_id)
+            raise
+
+        if cur.rowcount == 0:
+            # записи нет, но конфликт всё равно сообщаем — как в остальных репозиториях
+            self._raise_conflict(new_supplier, exclude_id=supplier_id)
+            return False
+
+        new_supplier.supplier_id = supplier_id
+        return True
+
+    # f) Удалить элемент по ID
+    def delete_by_id(self, supplier_id: int) -> bool:
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM suppliers WHERE supplier_id=?;", (supplier_id,))
+        return cur.rowcount > 0
+
+    # g) Получить количество элементов
+    def get_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM suppliers;").fetchone()[0]
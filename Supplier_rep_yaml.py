@@ -1,31 +1,110 @@
+import hashlib
+import marshal
+import os
 import yaml
-from Supplier import Supplier
-from Supplier_rep_base import Supplier_rep_base
+from Supplier_rep_base import Supplier_rep_base, atomic_open
+
+# C-реализация (libyaml) в разы быстрее чистого Python; если PyYAML собран без неё — обычные классы
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 class Supplier_rep_yaml(Supplier_rep_base):
-    def __init__(self, file_path: str):
+    """
+    snapshot=True включает двоичный снимок разобранных данных рядом с файлом
+    (<file_path>.snapshot, формат marshal). Снимок используется, только если sha256
+    содержимого YAML-файла совпадает с записанным в нём; при совпадении разбор YAML
+    пропускается полностью (файл читается лишь для хеша). Если изменились только
+    mtime/размер, а содержимое то же, переписывается заголовок снимка.
+    """
+
+    _SNAPSHOT_FORMAT = 1
+
+    def __init__(self, file_path: str, journal: bool = False, compact_threshold: int = 1000,
+                 validation: str = "strict", snapshot: bool = False):
         if not (file_path.endswith(".yaml") or file_path.endswith(".yml")):
             raise ValueError("Файл должен быть формата .yaml или .yml")
-        super().__init__(file_path)
+        super().__init__(file_path, journal=journal, compact_threshold=compact_threshold,
+                         validation=validation)
+        self.snapshot = snapshot
+        self.snapshot_path = file_path + ".snapshot"
+
+    def _read_data(self) -> list:
+        if self.snapshot:
+            return self._read_with_snapshot()
 
-    def read_all(self) -> list:
         try:
             with open(self.file_path, "r", encoding="utf-8") as file:
-                data = yaml.safe_load(file)
+                data = yaml.load(file, Loader=YamlLoader)
                 if data is None:
                     data = []
         except FileNotFoundError:
             data = []
 
-        return [Supplier(item) for item in data]
-
-    def write_all(self, suppliers: list) -> None:
-        data = [supplier.to_dict() for supplier in suppliers]
-        with open(self.file_path, "w", encoding="utf-8") as file:
-            yaml.safe_dump(
-                data,
-                file,
-                allow_unicode=True,
-                sort_keys=False
-            )
+        return data
+
+    def _write_data(self, data: list) -> None:
+        text = yaml.dump(
+            data,
+            Dumper=YamlDumper,
+            allow_unicode=True,
+            sort_keys=False
+        )
+        with self._atomic_open() as file:
+            file.write(text)
+
+        if self.snapshot:
+            self._write_snapshot_file(data, hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+    # --- Двоичный снимок ---
+    def _read_snapshot_file(self):
+        """
+        (заголовок, данные) или None, если снимка нет или он не разбирается
+        """
+        try:
+            with open(self.snapshot_path, "rb") as file:
+                header, data = marshal.load(file)
+            snapshot_format, _, _, _ = header
+            if snapshot_format != self._SNAPSHOT_FORMAT or not isinstance(data, list):
+                return None
+        except (FileNotFoundError, EOFError, ValueError, TypeError):
+            return None
+        return header, data
+
+    def _write_snapshot_file(self, data: list, digest: str) -> None:
+        """
+        Снимок — только ускорение, поэтому ошибки записи не пробрасываются:
+        ни ошибки файловой системы, ни значения, которые marshal не сохраняет
+        (ValueError/TypeError, например даты из YAML). Тогда файл просто читается как YAML.
+        """
+        try:
+            st = os.stat(self.file_path)
+            header = (self._SNAPSHOT_FORMAT, st.st_mtime_ns, st.st_size, digest)
+            with atomic_open(self.snapshot_path, "wb") as file:
+                marshal.dump((header, data), file)
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def _read_with_snapshot(self) -> list:
+        try:
+            with open(self.file_path, "rb") as file:
+                st = os.fstat(file.fileno())
+                raw = file.read()
+        except FileNotFoundError:
+            return []
+
+        digest = hashlib.sha256(raw).hexdigest()
+        cached = self._read_snapshot_file()
+        if cached is not None:
+            (_, mtime_ns, size, cached_digest), data = cached
+            if cached_digest == digest:
+                if mtime_ns != st.st_mtime_ns or size != st.st_size:
+                    # файл тронут (mtime), но содержимое то же — обновляем только заголовок снимка
+                    self._write_snapshot_file(data, digest)
+                return data
+
+        data = yaml.load(raw.decode("utf-8"), Loader=YamlLoader)
+        if data is None:
+            data = []
+        self._write_snapshot_file(data, digest)
+        return data
@@ -0,0 +1,230 @@
+"""
+Замеры производительности репозиториев Supplier.
+
+Для каждого хранилища и каждого размера N генерируются N валидных уникальных поставщиков
+(Supplier_generator, seed задаётся --seed), после чего по отдельности замеряются операции
+репозитория: get_by_id, get_k_n_short_list, sort_by_city, add_supplier, replace_by_id,
+delete_by_id, get_count.
+
+Результат — JSON (ops/sec, p50/p99 в мс, пиковая память по tracemalloc на одну операцию),
+чтобы прогоны можно было сравнивать между собой:
+
+    python benchmark.py --sizes 1000 100000 --backends json yaml sqlite --out bench.json
+
+Вместо PostgreSQL по умолчанию используется SQLite (Supplier_rep_sqlite); реальный PostgreSQL
+подключается параметрами --pg-*. Таблица suppliers в нём ОЧИЩАЕТСЯ — только для временной БД.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from Supplier import Supplier
+from Supplier_generator import SupplierGenerator
+
+
+# --- Хранилища ---
+def open_json(workdir, records, args):
+    from Supplier_rep_json import Supplier_rep_json
+    repo = Supplier_rep_json(os.path.join(workdir, "suppliers.json"), journal=args.journal)
+    repo._write_data(records)
+    return repo
+
+
+def open_yaml(workdir, records, args):
+    from Supplier_rep_yaml import Supplier_rep_yaml
+    repo = Supplier_rep_yaml(os.path.join(workdir, "suppliers.yaml"), journal=args.journal)
+    repo._write_data(records)
+    return repo
+
+
+def open_sqlite(workdir, records, args):
+    from Supplier_rep_sqlite import Supplier_rep_sqlite
+    repo = Supplier_rep_sqlite(os.path.join(workdir, "suppliers.db"))
+    with repo._conn:
+        repo._conn.executemany(
+            """
+            INSERT INTO suppliers (supplier_id, name, contact_name, phone, email, city, address, inn,
+                                   name_key, inn_key, email_key, phone_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            (
+                (r["supplier_id"], r["name"], r["contact_name"], r["phone"], r["email"],
+                 r["city"], r["address"], r["inn"], *repo._keys(Supplier.from_trusted(r)))
+                for r in records
+            )
+        )
+    return repo
+
+
+def open_postgres(workdir, records, args):
+    from Supplier_rep_DB import Supplier_rep_DB
+    repo = Supplier_rep_DB(dbname=args.pg_dbname, user=args.pg_user, password=args.pg_password,
+                           host=args.pg_host, port=args.pg_port)
+    repo.migrate()
+    with repo._connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE suppliers RESTART IDENTITY;")
+    repo.add_suppliers([Supplier.from_trusted(r) for r in records])
+    return repo
+
+
+BACKENDS = {
+    "json": open_json,
+    "yaml": open_yaml,
+    "sqlite": open_sqlite,
+    "postgres": open_postgres,
+}
+
+
+# --- Замеры ---
+def percentile(sorted_values: list, p: float) -> float:
+    """
+    Перцентиль по ближайшему рангу
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def measure(op, calls: list) -> dict:
+    """
+    calls — список кортежей аргументов, op вызывается по одному разу на каждый.
+    Пиковая память замеряется отдельным последним вызовом под tracemalloc,
+    чтобы трассировка не искажала время.
+    """
+    latencies = []
+    for call_args in calls[:-1]:
+        t0 = time.perf_counter_ns()
+        op(*call_args)
+        latencies.append(time.perf_counter_ns() - t0)
+
+    tracemalloc.start()
+    op(*calls[-1])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if not latencies:
+        latencies = [0]
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": round(len(latencies) / (total / 1e9), 2) if total else None,
+        "p50_ms": round(percentile(latencies, 50) / 1e6, 4),
+        "p99_ms": round(percentile(latencies, 99) / 1e6, 4),
+        "peak_bytes": peak,
+    }
+
+
+def run_backend(name: str, size: int, args, rnd: random.Random) -> list:
+    workdir = tempfile.mkdtemp(prefix=f"bench_{name}_")
+    results = []
+    gen = SupplierGenerator(seed=args.seed)
+    try:
+        records = list(gen.iter_records(size))
+        t0 = time.perf_counter()
+        repo = BACKENDS[name](workdir, records, args)
+        load_seconds = time.perf_counter() - t0
+        del records
+
+        def report(op: str, calls: list, fn) -> None:
+            r = measure(fn, calls)
+            r.update({"backend": name, "size": size, "op": op})
+            results.append(r)
+            print(f"{name:>8} {size:>9} {op:<20} {r['ops_per_sec']} ops/s "
+                  f"p50={r['p50_ms']}ms p99={r['p99_ms']}ms peak={r['peak_bytes']}B", file=sys.stderr)
+
+        results.append({"backend": name, "size": size, "op": "load", "seconds": round(load_seconds, 4)})
+
+        reads = args.ops + 1
+        heavy = args.heavy_ops + 1
+        writes = args.write_ops + 1
+        k = 20
+        pages = max(1, size // k)
+
+        # первый вызов прогревает кэш файловых репозиториев и в замер не входит
+        repo.get_count()
+
+        report("get_count", [()] * reads, repo.get_count)
+        report("get_by_id", [(rnd.randint(1, size),) for _ in range(reads)], repo.get_by_id)
+        report("get_k_n_short_list", [(k, rnd.randint(1, pages)) for _ in range(reads)], repo.get_k_n_short_list)
+        report("sort_by_city", [()] * heavy, repo.sort_by_city)
+
+        # новые уникальные поставщики — следующие номера генератора после исходных N
+        fresh = iter(range(size, size + 2 * writes))
+        added = []
+
+        def add(supplier):
+            repo.add_supplier(supplier)
+            added.append(supplier.supplier_id)
+
+        report("add_supplier", [(Supplier(gen.record(next(fresh))),) for _ in range(writes)], add)
+        report("replace_by_id", [(rnd.randint(1, size), Supplier(gen.record(next(fresh)))) for _ in range(writes)],
+               repo.replace_by_id)
+        report("delete_by_id", [(supplier_id,) for supplier_id in added], repo.delete_by_id)
+
+        close = getattr(repo, "close", None)
+        if close is not None:
+            close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Замеры операций репозиториев Supplier")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--backends", nargs="+", default=["json", "yaml", "sqlite"], choices=list(BACKENDS))
+    parser.add_argument("--ops", type=int, default=200, help="вызовов на каждую операцию чтения")
+    parser.add_argument("--heavy-ops", type=int, default=5, help="вызовов sort_by_city")
+    parser.add_argument("--write-ops", type=int, default=20, help="вызовов add/replace/delete")
+    parser.add_argument("--journal", action="store_true", help="файловые репозитории в режиме журнала")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="файл для результатов (по умолчанию stdout)")
+    parser.add_argument("--pg-dbname")
+    parser.add_argument("--pg-user")
+    parser.add_argument("--pg-password")
+    parser.add_argument("--pg-host", default="localhost")
+    parser.add_argument("--pg-port", type=int, default=5432)
+    args = parser.parse_args(argv)
+
+    if "postgres" in args.backends and not args.pg_dbname:
+        parser.error("для postgres нужен --pg-dbname (временная БД: таблица suppliers очищается)")
+
+    rnd = random.Random(args.seed)
+    results = []
+    for size in args.sizes:
+        for name in args.backends:
+            results.extend(run_backend(name, size, args, rnd))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k != "pg_password"},
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
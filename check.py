@@ -184,4 +184,6 @@ db_repo = Supplier_rep_DB(
     host="localhost",
     port=5432
 )
+# создаёт таблицу и индексы уникальности, если их ещё нет (без них запись запрещена)
+db_repo.migrate()
 test_db_repository(db_repo, "PostgreSQL")